@@ -1,35 +1,42 @@
-# base class for the TWA
-from datetime import datetime as time
-import io
-
-class Base:
-
-    # instance counter
-    __counter = 0          # class attribute
-    __log     = "profiles.log"
-
-    # constructor
-    def __init__(self,log = ""):
-        Base.__counter += 1
-        if len(log) > 0: Base.__log = log  
-
-        self.AppendLog(">> Instance %d created." % Base.__counter)
-
-    # reset the log
-    def Reset(self):
-        io.remove(Base.__log)        
-
-    # log function
-    def AppendLog(self,text):
-
-        t         = time.now()          # get the actual time
-        timestamp = "%2.2d.%2.2d.%2.2d|" % (t.hour,t.minute,t.second)
-        textout   = timestamp + text    # output text
-
-        # create a file object
-        f = file(Base.__log,"a")        # open for append
-        f.write(textout + "\n")         # add linebreak
-        f.close()    
-
-        # print to the screen
-        print textout
\ No newline at end of file
+# base class for the TWA
+import os
+from logWriter import LogWriter, DEBUG, INFO
+
+class Base:
+
+    # instance counter
+    __counter = 0          # class attribute
+    __log     = "profiles.log"
+    __writer  = None       # log writer shared by all instances
+
+    # constructor
+    def __init__(self,log = ""):
+        Base.__counter += 1
+        if len(log) > 0 and log != Base.__log:
+            Base.__log = log
+            if Base.__writer is not None: Base.__writer.close()
+            Base.__writer = None
+
+        self.AppendLog(">> Instance %d created." % Base.__counter, DEBUG)
+
+    # get the log writer, created on first use
+    @staticmethod
+    def GetLogWriter():
+        if Base.__writer is None: Base.__writer = LogWriter(Base.__log)
+        return Base.__writer
+
+    # replace the log writer, e.g. by a QueueLogWriter in worker processes,
+    # the replaced writer is closed
+    @staticmethod
+    def SetLogWriter(writer):
+        if Base.__writer is not None and Base.__writer is not writer: Base.__writer.close()
+        Base.__writer = writer
+
+    # reset the log
+    def Reset(self):
+        Base.GetLogWriter().discard()
+        if os.path.exists(Base.__log): os.remove(Base.__log)
+
+    # log function
+    def AppendLog(self,text,level = INFO):
+        Base.GetLogWriter().write(text, level)
@@ -0,0 +1,112 @@
+#==============================================================================
+# benchmark of the model stages against the fake CAE layer (fakeAbaqus.py)
+#
+# Builds, solves and postprocesses the profiles at several mesh sizes and
+# records the stage report of the StageTimer. Every run is appended to a
+# history file (json lines), the stages are compared with the last run of
+# the same case, so regressions are visible.
+#
+# usage: python benchmark.py [factor ...]      (mesh factors, default 1 2 4)
+#==============================================================================
+
+import json
+import os
+import sys
+import time
+
+import fakeAbaqus
+fakeAbaqus.install()
+
+from Base import Base
+from inputData import InputData
+from stageTimer import StageTimer
+from quadBeamModel import QuadBeamModel
+
+# profiles of the benchmark, the combined profiles of inputData.py
+PROFILES = {"CP1": {"a_q": 120, "b_q": 60},
+            "CP2": {"a_q": 140, "b_q": 80},
+            "CP3": {"a_q": 160, "b_q": 90}}
+
+# seeds scaled by the mesh factor
+SEEDS = ("quadHeightSeed", "quadWidthSeed", "tFlangeSeed", "tWebSeed", "lengthSeed")
+
+class Benchmark(Base):
+
+    # history   : json lines file with the reports of all runs
+    # threshold : ratio to the last run, above which a stage is a regression
+    # minTime   : stages faster than minTime are not compared
+    def __init__(self, history = "benchmark.jsonl", threshold = 1.25, minTime = 0.01):
+        Base.__init__(self)
+        self.history   = history
+        self.threshold = threshold
+        self.minTime   = minTime
+
+    # InputData of a profile and a mesh factor
+    def getData(self, profile, factor):
+        data = InputData()
+        params = dict(PROFILES[profile])
+        for key in SEEDS: params[key] = getattr(data, key) * factor
+        params["name"] = "%s-M%d" % (profile, factor)
+        return InputData(**params)
+
+    # run all stages of a case, returns the stage report
+    def runCase(self, profile, factor):
+        data = self.getData(profile, factor)
+        fakeAbaqus.register(data)
+        model = QuadBeamModel(data, timer = StageTimer())
+        model.build()
+        model.submit()
+        model.postprocess()
+        model.exportImage()
+        model.delete()
+
+        report = model.timer.getReport()
+        report.update({"case": data.name, "profile": profile, "factor": factor, "time": time.time()})
+        return report
+
+    # last report of every case in the history
+    def loadHistory(self):
+        last = {}
+        if not os.path.exists(self.history): return last
+        for line in open(self.history):
+            line = line.strip()
+            if len(line) == 0: continue
+            report = json.loads(line)
+            last[report["case"]] = report
+        return last
+
+    # stages slower than threshold times the last run: list of (stage, ratio)
+    def compare(self, report, last):
+        regressions = []
+        before = dict((record["stage"], record["wall"]) for record in last["stages"])
+        for record in report["stages"]:
+            if record["stage"] not in before or record["wall"] < self.minTime: continue
+            ratio = record["wall"] / max(before[record["stage"]], 1.e-9)
+            if ratio > self.threshold: regressions.append((record["stage"], ratio))
+        return regressions
+
+    # run the cases of all profiles and mesh factors, returns the reports
+    def run(self, factors = (1, 2, 4), profiles = None):
+        if profiles is None: profiles = sorted(PROFILES.keys())
+        last    = self.loadHistory()
+        reports = []
+        f = open(self.history, "a")
+        for profile in profiles:
+            for factor in factors:
+                report = self.runCase(profile, factor)
+                f.write(json.dumps(report, sort_keys = True) + "\n")
+                reports.append(report)
+
+                self.AppendLog("%-10s %7d nodes %7d elements %8.3f s wall %8.3f s cpu %8.1f MB"
+                               % (report["case"], report["counts"]["nodes"], report["counts"]["elements"],
+                                  report["wall"], report["cpu"], report["peakMemory"] or 0.))
+                if report["case"] in last:
+                    for stage, ratio in self.compare(report, last[report["case"]]):
+                        self.AppendLog("  regression: stage '%s' %.2f times slower than the last run"
+                                       % (stage, ratio))
+        f.close()
+        return reports
+
+if __name__ == "__main__":
+    factors = [int(arg) for arg in sys.argv[1:]] or [1, 2, 4]
+    Benchmark().run(factors)
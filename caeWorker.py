@@ -0,0 +1,298 @@
+#==============================================================================
+# long-lived CAE worker serving model requests over a local connection
+#
+# The worker loads the CAE kernel and the model modules once and keeps the
+# mdb and the odb sessions open between the requests, so a run only pays
+# for building the changed stages, solving and reading the model:
+#   abaqus cae noGUI=caeWorker.py -- 47110      (CAE kernel)
+#   python caeWorker.py --stub 47110            (stand-in without Abaqus)
+#
+# The messages are JSON objects over multiprocessing.connection, so the
+# client and the kernel may run different Python versions.
+#   request : {"command": ..., "params": {...}, "cpus": n, "headless": false}
+#   reply   : {"status": "ok", ...} or {"status": "error", "error": text}
+# commands  : ping, build, submit, postprocess, release, run (all four
+#             steps of a model), reload (the model modules), stop
+#==============================================================================
+
+import json
+import os
+import sys
+import time
+from multiprocessing import current_process
+from multiprocessing.connection import Client, Listener
+
+try:
+    from importlib import reload
+except ImportError:
+    pass                    # python 2: builtin reload
+
+import inputData
+from Base import Base
+from logWriter import DEBUG
+from parameterSweep import FakeBackend, SolverBackend
+from resultData import ResultData
+
+# default address of the worker and the key of the connection
+PORT    = 47110
+AUTHKEY = b"twa-cae-worker"
+
+# send a message as JSON
+def sendMessage(conn, message):
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+# receive a JSON message
+def receiveMessage(conn):
+    return json.loads(conn.recv_bytes().decode("utf-8"))
+
+# send a single request to a worker and return the reply
+def request(message, address = ("localhost", PORT), authkey = AUTHKEY):
+    conn = Client(address, authkey = authkey)
+    try:
+        sendMessage(conn, message)
+        return receiveMessage(conn)
+    finally:
+        conn.close()
+
+#------------------------------------------------------------------------------
+# handlers: execute the model steps in the worker
+#------------------------------------------------------------------------------
+class WorkerHandler:
+    name = "base"
+
+    # build the model and the job
+    def build(self, data, cpus = 1):
+        raise NotImplementedError("error: build is not implemented for handler '%s'" % self.name)
+
+    # submit the job and wait for the solver
+    def submit(self, data):
+        raise NotImplementedError("error: submit is not implemented for handler '%s'" % self.name)
+
+    # read the results, returns the name of the npz result file
+    # headless: no viewport and no image export
+    def postprocess(self, data, headless = False):
+        raise NotImplementedError("error: postprocess is not implemented for handler '%s'" % self.name)
+
+    # release the model of a finished run
+    def release(self, data):
+        pass
+
+    # reload the model modules after a change
+    def reload(self):
+        pass
+
+# runs the model steps of quadBeamModel.py in the CAE kernel
+class AbaqusHandler(WorkerHandler):
+    name = "abaqus"
+
+    # modelName: all runs share one model in the mdb, so the unchanged
+    # stages (e.g. the mesh in a load sweep) are reused between the runs
+    def __init__(self, modelName = "TWA-Worker"):
+        # the kernel modules are only available in abaqus cae
+        import quadBeamModel
+        self.model     = quadBeamModel
+        self.modelName = modelName
+        self.jobs      = {}     # jobname -> QuadBeamModel of the built models
+
+    def build(self, data, cpus = 1):
+        model = self.model.QuadBeamModel(data, cpus, modelName = self.modelName)
+        model.build()
+        self.jobs[data.jobname] = model
+
+    def getModel(self, data):
+        if data.jobname not in self.jobs:
+            raise Exception("error: Job '%s' is not built" % data.jobname)
+        return self.jobs[data.jobname]
+
+    def submit(self, data):
+        self.getModel(data).submit()
+
+    def postprocess(self, data, headless = False):
+        model  = self.getModel(data)
+        model.headless = headless
+        result = model.postprocess()
+        if result is None:
+            raise Exception("error: No postprocessing for step '%s'" % data.stepname)
+        model.exportImage()
+        model.timer.Save(data.jobname + "-timing.json")
+        return os.path.abspath(data.jobname + "-result.npz")
+
+    # the job and the odb of the run are removed, every run of a sweep has
+    # its own job name, so the session would collect them otherwise
+    def release(self, data):
+        model = self.jobs.pop(data.jobname, None)
+        if model is not None: model.deleteJob()
+        self.model.closeOdb(data.jobname + ".odb")
+
+    # the worker takes InputData from the module, so it uses the reloaded class
+    def reload(self):
+        reload(inputData)
+        reload(self.model)
+
+# stand-in for the kernel: the results of FakeBackend, the delay emulates
+# the solver time, so the protocol and the throughput can be tested
+class StubHandler(WorkerHandler):
+    name = "stub"
+
+    def __init__(self, delay = 0.1):
+        self.delay  = delay
+        self.models = {}        # jobname -> cpus of the built models
+
+    def build(self, data, cpus = 1):
+        self.models[data.jobname] = cpus
+
+    def submit(self, data):
+        if data.jobname not in self.models:
+            raise Exception("error: Job '%s' is not built" % data.jobname)
+        time.sleep(self.delay / self.models[data.jobname])
+
+    def postprocess(self, data, headless = False):
+        result   = FakeBackend(delay = 0.).solve(data)
+        filename = os.path.abspath(data.jobname + "-result.npz")
+        result.Save(filename)
+        return filename
+
+    def release(self, data):
+        self.models.pop(data.jobname, None)
+
+#------------------------------------------------------------------------------
+# worker: serves the requests of the clients one after the other
+#------------------------------------------------------------------------------
+class CaeWorker(Base):
+
+    def __init__(self, handler, address = ("localhost", PORT), authkey = AUTHKEY):
+        Base.__init__(self)
+        self.handler  = handler
+        self.address  = address
+        self.authkey  = authkey
+        self.running  = False
+        self.requests = 0       # number of served requests
+        self.errors   = 0       # number of failed requests
+        self.busy     = 0.      # time spent in the requests
+        self.started  = None
+
+    # InputData of a request
+    def getData(self, message):
+        params = dict((str(key), value) for key, value in message.get("params", {}).items())
+        if "name" in params: params["name"] = str(params["name"])
+        return inputData.InputData(**params)
+
+    # execute a request, returns the reply
+    def handle(self, message):
+        command = message.get("command")
+        handler = self.handler
+        if command == "ping":
+            return {"status": "ok", "handler": handler.name, "pid": os.getpid()}
+        if command == "stop":
+            self.running = False
+            return {"status": "ok"}
+        if command == "reload":
+            handler.reload()
+            return {"status": "ok"}
+
+        data     = self.getData(message)
+        cpus     = int(message.get("cpus", 1))
+        headless = bool(message.get("headless", False))
+        if command == "build":
+            handler.build(data, cpus)
+            return {"status": "ok", "job": data.jobname}
+        if command == "submit":
+            handler.submit(data)
+            return {"status": "ok", "job": data.jobname}
+        if command == "postprocess":
+            return {"status": "ok", "job": data.jobname, "result": handler.postprocess(data, headless)}
+        if command == "release":
+            handler.release(data)
+            return {"status": "ok", "job": data.jobname}
+        if command == "run":
+            try:
+                handler.build(data, cpus)
+                handler.submit(data)
+                filename = handler.postprocess(data, headless)
+            finally:
+                handler.release(data)
+            return {"status": "ok", "job": data.jobname, "result": filename,
+                    "odbPath": os.path.abspath(data.jobname + ".odb")}
+        raise Exception("error: Unknown command '%s'" % command)
+
+    # serve the connections until a stop request
+    def serve(self):
+        listener = Listener(self.address, authkey = self.authkey)
+        self.AppendLog("cae worker '%s' listening on %s:%d..." % ((self.handler.name,) + tuple(self.address)))
+        self.running = True
+        self.started = time.time()
+        try:
+            while self.running:
+                conn = listener.accept()
+                try:
+                    while self.running:
+                        try:
+                            message = receiveMessage(conn)
+                        except EOFError:
+                            break
+                        sendMessage(conn, self.execute(message))
+                finally:
+                    conn.close()
+        finally:
+            listener.close()
+        self.AppendLog("cae worker stopped: %s" % json.dumps(self.getReport(), sort_keys = True))
+
+    # execute a request, errors are replied to the client
+    def execute(self, message):
+        start = time.time()
+        try:
+            reply = self.handle(message)
+        except Exception as e:
+            self.errors += 1
+            reply = {"status": "error", "error": str(e)}
+        self.requests += 1
+        self.busy     += time.time() - start
+        self.AppendLog("  %-11s %-30s %8.3f s %s" % (message.get("command"),
+                       message.get("params", {}).get("name", ""), time.time() - start, reply["status"]), DEBUG)
+        return reply
+
+    # counters of the worker
+    def getReport(self):
+        elapsed = time.time() - self.started if self.started else 0.
+        return {"requests": self.requests, "errors": self.errors, "busy": self.busy,
+                "elapsed": elapsed, "utilization": self.busy / elapsed if elapsed > 0. else 0.}
+
+#------------------------------------------------------------------------------
+# backend of the sweep runner: runs the models on warm workers
+#------------------------------------------------------------------------------
+class WorkerBackend(SolverBackend):
+    name = "worker"
+
+    # addresses: list of the worker addresses. The processes of a sweep pool
+    # are assigned to the workers round robin, so maxJobs should not exceed
+    # the number of workers.
+    # headless: the workers skip the viewport and the image export
+    def __init__(self, addresses = (("localhost", PORT),), authkey = AUTHKEY, headless = False):
+        self.addresses = [tuple(address) for address in addresses]
+        self.authkey   = authkey
+        self.headless  = headless
+
+    # worker of the calling process
+    def getAddress(self):
+        identity = current_process()._identity
+        number   = identity[-1] - 1 if identity else 0
+        return self.addresses[number % len(self.addresses)]
+
+    def solve(self, data, cpus = 1):
+        reply = request({"command": "run", "params": data.getParameters(), "cpus": cpus,
+                         "headless": self.headless}, self.getAddress(), self.authkey)
+        if reply["status"] != "ok":
+            raise Exception("error: cae worker failed for job '%s': %s" % (data.jobname, reply["error"]))
+
+        result = ResultData()
+        result.Load(reply["result"])
+        result.odbPath = reply["odbPath"]
+        return result
+
+# start a worker: [--stub] [port], arguments of abaqus cae after "--"
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--" in args: args = args[args.index("--") + 1:]
+    port = int(args[-1]) if len(args) > 0 and args[-1].isdigit() else PORT
+    handler = StubHandler() if "--stub" in args else AbaqusHandler()
+    CaeWorker(handler, ("localhost", port)).serve()
@@ -0,0 +1,258 @@
+#==============================================================================
+# stand-in for the abaqus, caeModules and abaqusConstants modules
+#
+# Implements the part of the CAE API used by quadBeamModel.py, so the model
+# stages can be run and timed without Abaqus (benchmark.py). The kernel
+# calls only record their arguments; the mesh comes from ShellMesh, the
+# solver returns the deflection of a simply supported box beam and the odb
+# serves the results as bulk data blocks like the real one.
+#
+# The part does not know its InputData, so the data of a model has to be
+# registered under the model name before the build:
+#   fakeAbaqus.install()
+#   fakeAbaqus.register(data)           (model name data.name)
+#   from quadBeamModel import QuadBeamModel
+#==============================================================================
+
+import os
+import sys
+import types
+
+import numpy as np
+
+from shellMesh import ShellMesh
+
+# InputData of the registered models: name -> data
+MODELS = {}
+
+# odbs written by the fake solver: path -> FakeOdb
+ODBS = {}
+
+# register the InputData of a model, name: model name, default data.name
+def register(data, name = None):
+    MODELS[data.name if name is None else name] = data
+
+# object which records the calls of its methods
+class Recorder:
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+        self.calls = []
+
+    def __getattr__(self, name):
+        if name.startswith("__"): raise AttributeError(name)
+        def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return Recorder(name = kwargs.get("name", name))
+        return call
+
+# repository of named objects (mdb.models, session.odbs, ...)
+class Repository(dict):
+    pass
+
+# findAt returns the probe points, sets and regions keep them
+class Geometry:
+
+    def findAt(self, *probes):
+        return tuple(probe[0] for probe in probes)
+
+class FakeNode:
+
+    def __init__(self, label, coordinates):
+        self.label       = label
+        self.coordinates = coordinates
+
+class FakePart(Recorder):
+
+    def __init__(self, name, **kwargs):
+        Recorder.__init__(self, name = name)
+        self.faces    = Geometry()
+        self.edges    = Geometry()
+        self.nodes    = []
+        self.elements = []
+        self.sets     = Repository()
+        self.mesh     = None
+
+    def deleteMesh(self, **kwargs):
+        self.mesh     = None
+        self.nodes    = []
+        self.elements = []
+
+    def generateMesh(self, **kwargs):
+        self.mesh     = ShellMesh(MODELS[self.name])
+        self.nodes    = [FakeNode(int(label), tuple(coord)) for label, coord
+                         in zip(self.mesh.labels, self.mesh.coords)]
+        self.elements = list(self.mesh.elementLabels)
+
+    def SetFromNodeLabels(self, nodeLabels, name):
+        self.sets[name] = Recorder(name = name, labels = np.array(nodeLabels, dtype=int))
+        return self.sets[name]
+
+class FakeAssembly(Recorder):
+
+    def __init__(self):
+        Recorder.__init__(self)
+        self.instances = Repository()
+        self.sets      = Repository()
+
+    def Instance(self, name, part, dependent = None):
+        self.instances[name] = Recorder(name = name, part = part, faces = Geometry())
+        return self.instances[name]
+
+    def SetFromNodeLabels(self, name, nodeLabels):
+        labels = np.concatenate([np.array(labels, dtype=int) for instance, labels in nodeLabels])
+        self.sets[name] = Recorder(name = name, labels = labels)
+        return self.sets[name]
+
+class FakeModel(Recorder):
+
+    def __init__(self, name):
+        Recorder.__init__(self, name = name)
+        self.parts        = Repository()
+        self.rootAssembly = FakeAssembly()
+        self.fieldOutputRequests = Repository()
+        self.fieldOutputRequests['F-Output-1'] = Recorder(name = 'F-Output-1')
+        self.materials = Repository()
+        self.sections  = Repository()
+        self.steps     = Repository(Initial = Recorder(name = 'Initial'))
+        self.loads     = Repository()
+        self.boundaryConditions = Repository()
+
+    def Part(self, name, **kwargs):
+        self.parts[name] = FakePart(name)
+        return self.parts[name]
+
+    def Material(self, name, **kwargs):
+        self.materials[name] = Recorder(name = name)
+        return self.materials[name]
+
+    def HomogeneousShellSection(self, name, **kwargs):
+        self.sections[name] = Recorder(name = name, **kwargs)
+        return self.sections[name]
+
+    def StaticStep(self, name, **kwargs):
+        self.steps[name] = Recorder(name = name, **kwargs)
+        return self.steps[name]
+
+    def Pressure(self, name, **kwargs):
+        self.loads[name] = Recorder(name = name, **kwargs)
+        return self.loads[name]
+
+    def DisplacementBC(self, name, **kwargs):
+        self.boundaryConditions[name] = Recorder(name = name, **kwargs)
+        return self.boundaryConditions[name]
+
+class FakeJob(Recorder):
+
+    def __init__(self, name, model, **kwargs):
+        Recorder.__init__(self, name = name, model = model)
+
+    def submit(self, **kwargs):
+        pass
+
+    # solve: deflection of a simply supported box beam at every node
+    def waitForCompletion(self):
+        model = mdb.models[self.model]
+        data  = MODELS[self.model]
+        part  = model.parts[self.model]
+        mesh  = part.mesh
+
+        a = 2. * data.qs
+        h = 2. * data.quad_y
+        I = data.s_q * h**3 / 6. + a * data.s_q * h**2 / 2.
+        q = data.p1 * a
+        z = mesh.coords[:,2]
+        disp = np.zeros((len(z), 3))
+        disp[:,1] = q * z * (data.l**3 - 2. * data.l * z**2 + z**3) / (24. * data.EMod * I)
+        ODBS[os.path.abspath(self.name + ".odb")] = FakeOdb(data.stepname, mesh.labels, mesh.coords,
+                                                            disp, part.sets['S'].labels)
+
+class FakeMdb:
+
+    def __init__(self):
+        self.models = Repository()
+        self.jobs   = Repository()
+
+    def Model(self, name, **kwargs):
+        self.models[name] = FakeModel(name)
+        return self.models[name]
+
+    def Job(self, name, model, **kwargs):
+        self.jobs[name] = FakeJob(name, model, **kwargs)
+        return self.jobs[name]
+
+#------------------------------------------------------------------------------
+# odb with bulk data blocks
+#------------------------------------------------------------------------------
+class FakeRegion:
+
+    def __init__(self, labels):
+        self.labels = labels
+
+class FakeField:
+
+    def __init__(self, labels, values):
+        self.labels = labels
+        self.values = values
+        self.bulkDataBlocks = [Recorder(nodeLabels = labels, data = values)]
+
+    def getSubset(self, region):
+        mask = np.isin(self.labels, region.labels)
+        return FakeField(self.labels[mask], self.values[mask])
+
+class FakeOdb(Recorder):
+
+    def __init__(self, stepname, labels, coords, disp, selection):
+        Recorder.__init__(self)
+        rf = np.zeros(coords.shape)
+        frame = Recorder(fieldOutputs = {"COORD" : FakeField(labels, coords),
+                                         "U"     : FakeField(labels, disp),
+                                         "RF"    : FakeField(labels, rf)})
+        instance = FakeRegion(labels)
+        instance.nodeSets = {"S": FakeRegion(selection)}
+        self.steps        = {stepname: Recorder(frames = [frame])}
+        self.rootAssembly = Recorder(instances = {"INSTANCE": instance})
+
+class FakeSession(Recorder):
+
+    def __init__(self):
+        Recorder.__init__(self)
+        self.odbs = Repository()
+        viewport  = Recorder(odbDisplay = Recorder(display = Recorder()), view = Recorder())
+        self.viewports = {"Viewport: 1": viewport}
+        self.pngOptions = Recorder()
+        self.defaultViewportAnnotationOptions = Recorder()
+
+    def openOdb(self, name, **kwargs):
+        if name not in ODBS:
+            raise Exception("error: Odb '%s' not found" % name)
+        self.odbs[name] = ODBS[name]
+        ODBS[name].close = lambda: self.odbs.pop(name, None)
+        return ODBS[name]
+
+mdb     = FakeMdb()
+session = FakeSession()
+
+# constants used by the model
+CONSTANTS = ("THREE_D", "DEFORMABLE_BODY", "S4R", "S3", "FIXED", "ON", "OFF", "UNIFORM",
+             "UNSET", "NODAL", "COMPONENT", "CONTOURS_ON_DEF", "SIZE_ON_SCREEN", "PNG",
+             "PERCENTAGE", "DEFAULT", "THREADS", "MPI")
+
+# install the modules, so "from abaqus import *" finds the fakes
+def install():
+    abaqus = types.ModuleType("abaqus")
+    abaqus.mdb     = mdb
+    abaqus.session = session
+    abaqus.__all__ = ["mdb", "session"]
+
+    caeModules = types.ModuleType("caeModules")
+    caeModules.mesh    = Recorder(name = "mesh")
+    caeModules.__all__ = ["mesh"]
+
+    abaqusConstants = types.ModuleType("abaqusConstants")
+    for name in CONSTANTS: setattr(abaqusConstants, name, name)
+    abaqusConstants.__all__ = list(CONSTANTS)
+
+    sys.modules["abaqus"]          = abaqus
+    sys.modules["caeModules"]      = caeModules
+    sys.modules["abaqusConstants"] = abaqusConstants
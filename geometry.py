@@ -0,0 +1,119 @@
+#==============================================================================
+# geometry table of the Quadrilateral Triple-T profile
+#
+# All key points, midline segments and probe points of the profile are
+# computed once from InputData and shared by the CAE model (quadBeamModel.py),
+# the structured mesher (shellMesh.py) and the node selections:
+#
+#   points   : key points of the section, name -> (x,y)
+#   segments : midline segments between the junctions
+#              (name, point 1, point 2, section, seed, divisor)
+#   faces    : probe point of every face of the extruded part, (name, section, probe)
+#   edges    : probe points of the seeded edges, seed -> [(divisor, probe), ...]
+#   vertices : node set -> points of the supports
+#   sketch   : lines of the sketch, the bottom of the tube is one line
+#
+# The tables only depend on the cross section and the length, they are
+# memoized, so a sweep over loads or seeds computes them once. The memo keeps
+# the CACHESIZE most recently used geometries, a sweep over many sections does
+# not grow it.
+#==============================================================================
+
+from collections import OrderedDict
+
+# sections of the segments, the same as in shellMesh.py
+QUAD = 0
+TSEC = 1
+
+# memoized geometries: key of the cross section -> ProfileGeometry,
+# the least recently used one first
+CACHESIZE = 32
+_CACHE    = OrderedDict()
+
+# geometry of an InputData object
+def getGeometry(data):
+    key = (data.qs, data.quad_y, data.lower_y, data.b_t, data.l)
+    geometry = _CACHE.pop(key, None)
+    if geometry is None: geometry = ProfileGeometry(*key)
+    _CACHE[key] = geometry
+    while len(_CACHE) > CACHESIZE: _CACHE.popitem(last = False)
+    return geometry
+
+class ProfileGeometry:
+
+    def __init__(self, qs, quad_y, lower_y, b_t, l):
+        self.qs, self.quad_y, self.lower_y, self.b_t, self.l = qs, quad_y, lower_y, b_t, l
+        self.createPoints()
+        self.createSegments()
+        self.createProbes()
+
+    # key points: corners of the tube, web tops and bottoms, flange ends
+    def createPoints(self):
+        qs, qy, ly, bt = self.qs, self.quad_y, self.lower_y, self.b_t / 2.
+        self.points = {"topRight"    : (+qs, qy), "topLeft"    : (-qs, qy),
+                       "bottomLeft"  : (-qs, -qy), "bottomRight" : (+qs, -qy)}
+        for name, x in (("T1", -qs), ("T2", 0.), ("T3", +qs)):
+            self.points[name + "top"]         = (x, -qy)
+            self.points[name + "bottom"]      = (x, -ly)
+            self.points[name + "flangeLeft"]  = (x - bt, -ly)
+            self.points[name + "flangeRight"] = (x + bt, -ly)
+
+    # midline segments, the seeds follow the seeding of abaqusQuadBeam.py
+    def createSegments(self):
+        self.segments = [("top",         "topRight",    "topLeft",     QUAD, "quadWidthSeed",  1),
+                         ("left",        "topLeft",     "bottomLeft",  QUAD, "quadHeightSeed", 1),
+                         ("bottomLeft",  "bottomLeft",  "T2top",       QUAD, "quadWidthSeed",  2),
+                         ("bottomRight", "T2top",       "bottomRight", QUAD, "quadWidthSeed",  2),
+                         ("right",       "bottomRight", "topRight",    QUAD, "quadHeightSeed", 1)]
+        for name in ("T1", "T2", "T3"):
+            self.segments += [(name + "web",         name + "top",        name + "bottom",      TSEC, "tFlangeSeed", 1),
+                              (name + "flangeLeft",  name + "flangeLeft", name + "bottom",      TSEC, "tWebSeed",    1),
+                              (name + "flangeRight", name + "bottom",     name + "flangeRight", TSEC, "tWebSeed",    1)]
+
+        # the sketch: the bottom of the tube and the flanges are single lines
+        p = self.points
+        self.sketch = [(p["topRight"], p["topLeft"]), (p["topLeft"], p["bottomLeft"]),
+                       (p["bottomLeft"], p["bottomRight"]), (p["bottomRight"], p["topRight"])]
+        for name in ("T1", "T2", "T3"):
+            self.sketch += [(p[name + "top"], p[name + "bottom"]),
+                            (p[name + "flangeLeft"], p[name + "flangeRight"])]
+
+    # end points of a segment
+    def getSegmentPoints(self, segment):
+        return self.points[segment[1]], self.points[segment[2]]
+
+    # midpoint of a segment
+    def getMidpoint(self, segment):
+        (x1, y1), (x2, y2) = self.getSegmentPoints(segment)
+        return ((x1 + x2) / 2., (y1 + y2) / 2.)
+
+    # probe points of the faces, the seeded edges and the supports
+    def createProbes(self):
+        l = self.l
+        self.faces = [(s[0], s[3], self.getMidpoint(s) + (l / 2.,)) for s in self.segments]
+
+        # the cross section edges at both ends and the length edges of the tube corners
+        self.edges = {"lengthSeed": [(1, p + (l / 2.,)) for p in
+                                     [self.points[n] for n in ("topRight", "topLeft", "bottomLeft", "bottomRight")]]}
+        for s in self.segments:
+            x, y = self.getMidpoint(s)
+            self.edges.setdefault(s[4], []).extend([(s[5], (x, y, 0.)), (s[5], (x, y, l))])
+
+        flangeEnds = [self.points[name + side] for name in ("T1", "T2", "T3") for side in ("flangeLeft", "flangeRight")]
+        webBottoms = [self.points[name + "bottom"] for name in ("T1", "T2", "T3")]
+        self.vertices = {"bcFixedAll" : [p + (0.,) for p in flangeEnds],
+                         "bcFixedY"   : [p + (l,) for p in flangeEnds],
+                         "bcFixedXZ"  : [p + (0.,) for p in flangeEnds + webBottoms]}
+
+    # face probes of a section, or of the named faces
+    def getFaceProbes(self, section = None, names = None):
+        return [probe for name, sec, probe in self.faces
+                if (section is None or sec == section) and (names is None or name in names)]
+
+    # box of the top face, (lo, hi)
+    def getTopBox(self):
+        return (-self.qs, self.quad_y, 0.), (+self.qs, self.quad_y, self.l)
+
+    # start point of the fiber on the top face at x = 0, along z
+    def getFiber(self):
+        return (0., self.quad_y, 0.)
@@ -0,0 +1,105 @@
+#==============================================================================
+# writes the model of abaqusQuadBeam.py as an Abaqus input deck
+#
+# The mesh comes from ShellMesh, so no CAE kernel is needed and the deck can
+# be submitted to the solver directly:
+#   abaqus job=CP1-Linear input=CP1-Linear.inp interactive
+#==============================================================================
+
+from Base import Base
+from shellMesh import ShellMesh
+
+class InpWriter(Base):
+
+    def __init__(self, data, mesh = None):
+        Base.__init__(self)
+        self.data = data
+        self.mesh = ShellMesh(data) if mesh is None else mesh
+
+    # write a list of labels, 16 per line
+    def writeLabels(self, f, labels):
+        labels = [int(label) for label in labels]
+        for i in range(0, len(labels), 16):
+            f.write(", ".join(["%d" % label for label in labels[i:i + 16]]) + "\n")
+
+    # write the deck, returns the file name
+    def write(self, filename = None):
+        d    = self.data
+        mesh = self.mesh
+        if filename is None: filename = d.jobname + ".inp"
+        self.AppendLog("write input deck '%s'..." % filename)
+
+        f = open(filename, "w")
+        f.write("*Heading\n")
+        f.write("Quadrilateral tube and triple T sections analysis\n")
+        f.write("** Job name: %s Model name: %s\n" % (d.jobname, d.name))
+        f.write("*Preprint, echo=NO, model=NO, history=NO, contact=NO\n")
+
+        # part: mesh, sets and sections
+        f.write("*Part, name=%s\n" % d.name)
+        f.write("*Node\n")
+        for label, (x, y, z) in zip(mesh.labels, mesh.coords):
+            f.write("%d, %.10g, %.10g, %.10g\n" % (label, x, y, z))
+        f.write("*Element, type=S4R\n")
+        for label, nodes in zip(mesh.elementLabels, mesh.elements):
+            f.write("%d, %d, %d, %d, %d\n" % (label, nodes[0], nodes[1], nodes[2], nodes[3]))
+
+        nodeSets = mesh.getNodeSets()
+        for name in ("S", "WEB"):
+            if name not in nodeSets: continue
+            f.write("*Nset, nset=%s\n" % name)
+            self.writeLabels(f, nodeSets[name])
+        for name, labels in sorted(mesh.getElementSets().items()):
+            f.write("*Elset, elset=%s\n" % name)
+            self.writeLabels(f, labels)
+
+        # QuadSet and TSet only group the elements, the sections are assigned
+        # to the section sets, elements on a symmetry plane have their own
+        for name, labels, thickness in mesh.getSectionSets():
+            f.write("*Elset, elset=%s\n" % name)
+            self.writeLabels(f, labels)
+            f.write("*Shell Section, elset=%s, material=Steel\n%.10g, 5\n" % (name, thickness))
+        f.write("*End Part\n")
+
+        # assembly: instance, boundary sets and the loaded surface
+        f.write("*Assembly, name=Assembly\n")
+        f.write("*Instance, name=INSTANCE, part=%s\n" % d.name)
+        f.write("*End Instance\n")
+        for name in ("bcFixedAll", "bcFixedY", "bcFixedXZ", "XSYMM", "ZSYMM"):
+            if len(nodeSets.get(name, [])) == 0: continue
+            f.write("*Nset, nset=%s, instance=INSTANCE\n" % name)
+            self.writeLabels(f, nodeSets[name])
+        # the normal of the top elements points upwards, a positive pressure
+        # on the positive side pushes the face down
+        f.write("*Surface, type=ELEMENT, name=pressureSurface\n")
+        f.write("INSTANCE.TOP, SPOS\n")
+        f.write("*End Assembly\n")
+
+        # material
+        f.write("*Material, name=Steel\n")
+        f.write("*Elastic\n%.10g, %.10g\n" % (d.EMod, d.nue))
+
+        # boundary conditions of the initial step
+        f.write("*Boundary\n")
+        if len(nodeSets["bcFixedAll"]) > 0:
+            f.write("bcFixedAll, ENCASTRE\n")
+        f.write("bcFixedY, 1, 2\n")
+        f.write("bcFixedY, 5, 6\n")
+        for name in ("XSYMM", "ZSYMM"):
+            if name in nodeSets: f.write("%s, %s\n" % (name, name))
+
+        # step
+        if d.steptype != d.LINEAR:
+            f.close()
+            raise Exception("error: Only the linear step is available in the input deck", d.stepname)
+        f.write("*Step, name=%s, nlgeom=NO\n" % d.stepname)
+        f.write("static analysis\n")
+        f.write("*Static\n1., 1., 1e-05, 1.\n")
+        f.write("*Dsload\n")
+        f.write("pressureSurface, P, %.10g\n" % -d.p1)
+        f.write("*Output, field\n")
+        f.write("*Node Output\nU, RF, CF, COORD\n")
+        f.write("*Element Output, directions=YES\nS, E\n")
+        f.write("*End Step\n")
+        f.close()
+        return filename
@@ -5,14 +5,81 @@
 # dimensions:  mm, N
 #==============================================================================
 
+import csv
+import json
+
 from Base import Base
 from math import sin
 from math import cos
 from math import radians as rad
 
+# parameters with integer values, the name is a string, all others are floats
+INTEGERS = ("maxElement", "quadHeightSeed", "quadWidthSeed", "tFlangeSeed", "tWebSeed",
+            "lengthSeed", "steptype", "symmetry", "numCpus", "numDomains", "mpMode")
+
+# parameters of the solver run, they do not affect the solution
+SOLVER = ("numCpus", "numDomains", "memory", "mpMode")
+
+# read a profile catalog row by row, yields (line number, dict of raw values).
+#   .csv   : header with parameter names, empty cells keep the default
+#   .jsonl : one json object per line
+#   .json  : a json object or a list of objects (read at once)
+def readCatalog(filename):
+    if filename.endswith(".csv"):
+        f = open(filename, "r")
+        try:
+            for number, row in enumerate(csv.DictReader(f)):
+                yield number + 2, dict((key.strip(), value.strip()) for key, value in row.items()
+                                       if key is not None and value is not None and value.strip() != "")
+        finally:
+            f.close()
+    elif filename.endswith(".jsonl"):
+        f = open(filename, "r")
+        try:
+            for number, line in enumerate(f):
+                if len(line.strip()) > 0: yield number + 1, json.loads(line)
+        finally:
+            f.close()
+    elif filename.endswith(".json"):
+        f = open(filename, "r")
+        content = json.load(f)
+        f.close()
+        if isinstance(content, dict): content = [content]
+        for number, row in enumerate(content):
+            yield number + 1, row
+    else:
+        raise Exception("error: Unknown catalog format", filename)
+
+# convert the raw values of a catalog row into parameters
+def convertParameters(row):
+    params = {}
+    for key, value in row.items():
+        key = str(key)
+        if key not in InputData.PARAMETERS:
+            raise Exception("error: Unknown input parameter", key)
+        if key == "name":       params[key] = str(value)
+        elif key in INTEGERS:
+            # "10" and "10.0" are accepted, "10.5" is not truncated
+            number = float(value)
+            if number != int(number):
+                raise Exception("error: Integer value expected for parameter", key, value)
+            params[key] = int(number)
+        else:                   params[key] = float(value)
+    return params
+
 class InputData(Base):
+    # parameters which define a single run (see getParameters)
+    PARAMETERS = ("name", "a_q", "b_q", "s_q", "b_t", "h_t", "s_t", "l",
+                  "EMod", "nue", "rho", "load",
+                  "maxElement", "quadHeightSeed", "quadWidthSeed",
+                  "tFlangeSeed", "tWebSeed", "lengthSeed", "steptype", "symmetry",
+                  "numCpus", "numDomains", "memory", "mpMode")
+
     # constructor
-    def __init__(self):
+    # keyword arguments override the selected profile (e.g. a_q = 140, load = -20.)
+    # check: False skips the geometric Check, for profiles already checked by
+    #        the vectorized rules of ProfileScreen (profileCatalog.py)
+    def __init__(self, check = True, **params):
         # uncomment the required combined profile(CP) here.
         name, a_q, b_q, s_q, b_t, h_t, s_t, l = "CP1", 120, 60, 4, 50, 50, 6, 3700
         # name, a_q, b_q, s_q, b_t, h_t, s_t, l = "CP2", 140, 80, 4, 50, 50, 6, 3700
@@ -50,18 +117,56 @@ class InputData(Base):
         self.LINEAR      = 0    # linear static calculation
         self.BUCKLING    = 1    # stability analysis
         self.stepnames   = ("Linear", "Buckling")
-        self.jobnames    = (self.name + "-Linear", self.name + "-Buckling")
         self.steptype    = self.LINEAR
+
+        # model reduction, the profile is symmetric to x = 0 and z = l/2
+        self.FULL        = 0    # full model
+        self.HALF        = 1    # x >= 0, symmetry conditions on x = 0
+        self.QUARTER     = 2    # x >= 0 and z <= l/2, approximate: the supports are not symmetric
+        self.symmetry    = self.FULL
+
+        # solver parameters, 0 is chosen by the SolverTuner (solverTuning.py)
+        self.DEFAULT     = 0    # multiprocessing mode of the platform
+        self.THREADS     = 1    # thread based parallelization
+        self.MPI         = 2    # mpi based parallelization
+        self.numCpus     = 0    # cores of the job
+        self.numDomains  = 0    # domains, a multiple of numCpus
+        self.memory      = 0.   # memory of the solver in % of the physical memory
+        self.mpMode      = self.DEFAULT
+
+        # override the default parameters
+        self.setParameters(params, check)
+
+    # set parameters of the run, the names and helpers are updated
+    def setParameters(self, params, check = True):
+        for key in params:
+            if key not in InputData.PARAMETERS:
+                raise Exception("error: Unknown input parameter", key)
+            setattr(self, key, params[key])
+
+        self.jobnames    = (self.name + "-Linear", self.name + "-Buckling")
         self.stepname    = self.stepnames[self.steptype]
         self.jobname     = self.jobnames[self.steptype]
 
-        self.Check()        # check for possible geometrical errors
-        self.calcHelpers()  # calculate helper variables
+        if check: self.Check()  # check for possible geometrical errors
+        self.CheckSolver()      # check the solver parameters
+        self.calcHelpers()      # calculate helper variables
+
+    # get the parameters of the run as a dictionary
+    def getParameters(self):
+        params = {}
+        for key in InputData.PARAMETERS:
+            params[key] = getattr(self, key)
+        return params
 
-    # load the inputdata from a file
-    def Load(self,filename):
-        # calculate helper variables
-        self.calcHelpers()
+    # load the inputdata from a file: a json object of parameters or
+    # the row of a profile catalog (csv, json lines), see readCatalog
+    def Load(self,filename,row = 0):
+        for number, (line, params) in enumerate(readCatalog(filename)):
+            if number == row:
+                self.setParameters(convertParameters(params))
+                return
+        raise Exception("error: Profile not found in catalog", filename, row)
 
     # check the input data
     def Check(self):
@@ -77,7 +182,7 @@ class InputData(Base):
         elif (self.s_t > self.h_t):
             raise Exception("error: Web length must be greater than T section thickness", self.s_t, self.h_t)
         else:
-            print"--------------ERROR CHECK ON T-SECTION SUCCESSFUL:::::NO ERRORS FOUND-----------------"
+            print("--------------ERROR CHECK ON T-SECTION SUCCESSFUL:::::NO ERRORS FOUND-----------------")
         if self.a_q < dmin:
             raise Exception("error: Invalid width for quadrilateral section", self.a_q)
         elif self.b_q < dmin:
@@ -85,11 +190,22 @@ class InputData(Base):
         elif (self.s_q > self.a_q) or (self.s_q > self.b_q):
             raise Exception("error: Both length and width of the quadrilateral section must be greater than it's thickness", self.s_q)
         else:
-            print"--------------ERROR CHECK SUCCESSFUL:::::NO ERRORS FOUND---------------"
+            print("--------------ERROR CHECK SUCCESSFUL:::::NO ERRORS FOUND---------------")
         if not self.a_q >= (2 * self.b_t):
             raise Exception("error: The T-beams collide each other")
         else:
-            print "--------------COLLISION CHECK SUCCESSFUL:::::NO ERRORS FOUND---------------"
+            print("--------------COLLISION CHECK SUCCESSFUL:::::NO ERRORS FOUND---------------")
+
+    # check the solver parameters
+    def CheckSolver(self):
+        if self.numCpus < 0 or self.numDomains < 0:
+            raise Exception("error: Invalid number of cpus or domains", self.numCpus, self.numDomains)
+        elif self.numCpus > 0 and self.numDomains % self.numCpus != 0:
+            raise Exception("error: The number of domains must be a multiple of the number of cpus", self.numDomains, self.numCpus)
+        elif self.memory < 0. or self.memory > 100.:
+            raise Exception("error: Invalid solver memory, 0 to 100 % of the physical memory", self.memory)
+        elif self.mpMode not in (self.DEFAULT, self.THREADS, self.MPI):
+            raise Exception("error: Invalid multiprocessing mode", self.mpMode)
 
     # calculate helper variables
     def calcHelpers(self):
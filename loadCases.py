@@ -0,0 +1,81 @@
+#==============================================================================
+# load cases of the linear step by superposition
+#
+# The deflection of the linear step scales with InputData.load, so the model
+# is solved once for a unit load and every load case and combination is
+# taken from the stored unit field:
+#
+#   engine = LoadCaseEngine(LocalBackend(), data)
+#   engine.addLoadCase("dead", -10.)
+#   engine.addLoadCase("live", -19.)
+#   engine.addCombination("ULS", {"dead": 1.35, "live": 1.5})
+#   result = engine.getResult("ULS")
+#==============================================================================
+
+from Base import Base
+from inputData import InputData
+
+class LoadCaseEngine(Base):
+
+    UNIT = 1.       # unit load [kN]
+
+    # backend : solver backend (see parameterSweep.py)
+    # data    : InputData of the geometry, its load is not used
+    def __init__(self, backend, data, cpus = 1):
+        Base.__init__(self)
+        if data.steptype != data.LINEAR:
+            raise Exception("error: Superposition is only valid for the linear step", data.stepname)
+        self.backend      = backend
+        self.data         = data
+        self.cpus         = cpus
+        self.unit         = None    # result of the unit load
+        self.loadCases    = {}      # name -> load [kN]
+        self.combinations = {}      # name -> {load case: factor}
+
+    # solve the unit load once
+    def getUnitResult(self):
+        if self.unit is None:
+            params = self.data.getParameters()
+            params["load"] = LoadCaseEngine.UNIT
+            params["name"] = self.data.name + "-Unit"
+            self.AppendLog("solve the unit load of '%s'..." % self.data.name)
+            self.unit = self.backend.solve(InputData(**params), self.cpus)
+        return self.unit
+
+    # add a load case with the load in kN
+    def addLoadCase(self, name, load):
+        self.loadCases[name] = float(load)
+
+    # add a combination of load cases: {load case: factor}
+    def addCombination(self, name, factors):
+        for case in factors:
+            if case not in self.loadCases:
+                raise Exception("error: Unknown load case in combination", name, case)
+        self.combinations[name] = dict(factors)
+
+    # total load of a load case, a combination or a load magnitude
+    def getLoad(self, case):
+        if case in self.loadCases:
+            return self.loadCases[case]
+        if case in self.combinations:
+            return sum(factor * self.loadCases[c] for c, factor in self.combinations[case].items())
+        return float(case)
+
+    # result of a load case, a combination or a load magnitude in kN
+    def getResult(self, case):
+        return self.getUnitResult().scaled(self.getLoad(case) / LoadCaseEngine.UNIT)
+
+    # results for a list of load cases, combinations or load magnitudes
+    def getResults(self, cases):
+        return [self.getResult(case) for case in cases]
+
+    # maximum deflection of all load cases and combinations
+    def getReport(self):
+        report = {}
+        for case in sorted(self.loadCases) + sorted(self.combinations):
+            result = self.getResult(case)
+            report[case] = {"load": self.getLoad(case), "maxDisp": result.getMaxDisp(),
+                            "sumRFo": result.sumRFo}
+            self.AppendLog("  %-12s load %10.3f kN, max deflection %10.4f"
+                           % (case, report[case]["load"], report[case]["maxDisp"]))
+        return report
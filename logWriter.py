@@ -0,0 +1,158 @@
+#==============================================================================
+# log writers used by Base.AppendLog
+#
+# LogWriter      : buffers the messages and writes them in batches
+# QueueLogWriter : sends the messages of a worker process to a queue
+# LogListener    : thread which writes the queued messages with a LogWriter,
+#                  so many processes can log into one file
+#
+# The default level is read from the environment variable TWA_LOGLEVEL
+# (DEBUG, INFO, WARNING, ERROR), per node tracing is logged with DEBUG.
+# The open writers are flushed at exit by a single handler, a closed writer
+# is dropped from it.
+#==============================================================================
+
+import atexit
+import json
+import os
+import threading
+import time
+
+# log levels
+DEBUG   = 10
+INFO    = 20
+WARNING = 30
+ERROR   = 40
+LEVELS  = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+NAMES   = dict((value, key) for key, value in LEVELS.items())
+
+# open LogWriters, flushed at exit
+_writers = []
+
+def flushWriters():
+    for writer in list(_writers): writer.flush()
+
+atexit.register(flushWriters)
+
+# level of the environment, INFO if not set
+def getDefaultLevel():
+    return LEVELS.get(os.environ.get("TWA_LOGLEVEL", "INFO").upper(), INFO)
+
+# buffered writer of a log file
+class LogWriter:
+
+    # filename      : log file
+    # level         : minimum level of the written messages
+    # format        : "text" (hh.mm.ss|message) or "json" (json lines)
+    # bufferSize    : number of buffered messages before a flush
+    # flushInterval : maximum age of the buffer in seconds
+    # echo          : print the messages to the screen
+    def __init__(self, filename, level = None, format = "text", bufferSize = 100,
+                 flushInterval = 1., echo = True):
+        if format not in ("text", "json"):
+            raise Exception("error: Unknown log format", format)
+        self.filename      = filename
+        self.level         = getDefaultLevel() if level is None else level
+        self.format        = format
+        self.bufferSize    = bufferSize
+        self.flushInterval = flushInterval
+        self.echo          = echo
+        self.buffer        = []
+        self.lastFlush     = time.time()
+        self.lock          = threading.Lock()
+        _writers.append(self)
+
+    # log a message
+    def write(self, text, level = INFO):
+        if level < self.level: return
+        self.emit((time.time(), level, os.getpid(), text))
+
+    # log a record (time, level, pid, text)
+    def emit(self, record):
+        t, level, pid, text = record
+        if level < self.level: return
+
+        if self.format == "json":
+            line = json.dumps({"time": t, "level": NAMES.get(level, level), "pid": pid, "text": text})
+        else:
+            lt   = time.localtime(t)
+            line = "%2.2d.%2.2d.%2.2d|%s" % (lt.tm_hour, lt.tm_min, lt.tm_sec, text)
+        if self.echo: print(line)
+
+        self.lock.acquire()
+        try:
+            self.buffer.append(line)
+            full = (len(self.buffer) >= self.bufferSize or level >= ERROR
+                    or time.time() - self.lastFlush > self.flushInterval)
+        finally:
+            self.lock.release()
+        if full: self.flush()
+
+    # write the buffered messages with a single write
+    def flush(self):
+        self.lock.acquire()
+        try:
+            lines, self.buffer = self.buffer, []
+            self.lastFlush = time.time()
+            if not lines: return
+            f = open(self.filename, "a")
+            f.write("\n".join(lines) + "\n")
+            f.close()
+        finally:
+            self.lock.release()
+
+    # forget the buffered messages
+    def discard(self):
+        self.lock.acquire()
+        self.buffer = []
+        self.lock.release()
+
+    # write the buffered messages, the writer is not flushed at exit anymore
+    def close(self):
+        self.flush()
+        if self in _writers: _writers.remove(self)
+
+# writer of a worker process, the messages are written by a LogListener
+class QueueLogWriter:
+
+    def __init__(self, queue, level = None):
+        self.queue = queue
+        self.level = getDefaultLevel() if level is None else level
+
+    def write(self, text, level = INFO):
+        if level < self.level: return
+        self.queue.put((time.time(), level, os.getpid(), text))
+
+    def flush(self):
+        pass
+
+    def discard(self):
+        pass
+
+    def close(self):
+        pass
+
+# thread which passes the queued records to a LogWriter
+class LogListener:
+
+    def __init__(self, queue, writer):
+        self.queue  = queue
+        self.writer = writer
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target = self.listen)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def listen(self):
+        while True:
+            record = self.queue.get()
+            if record is None: break
+            self.writer.emit(record)
+        self.writer.flush()
+
+    # write the remaining records and stop the thread
+    def stop(self):
+        self.queue.put(None)
+        self.thread.join()
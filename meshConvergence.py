@@ -0,0 +1,161 @@
+#==============================================================================
+# mesh convergence study of the seeds in InputData
+#
+# The seeds are refined by a ratio level by level. The length and width
+# seeds stay even, so there is a node at midspan and on the fiber. Rounding
+# the seeds changes the ratio, so the element size of a level is taken from
+# its element count (h ~ 1/sqrt(elements) on a surface). From the third
+# level on the converged maximum deflection is estimated by Richardson
+# extrapolation with the order observed in the last three levels (order 2,
+# if they do not converge monotonically). The study stops as soon as the
+# finest level is within the tolerance of the estimate, and the cheapest
+# level within the tolerance is recorded in the seed file for the profile
+# family, so later sweeps can reuse it.
+#
+# usage:
+#   study = ConvergenceStudy(LocalBackend(), InputData(), family = "CP")
+#   seeds = study.run()
+#   params.update(ConvergenceStudy.lookup("CP"))
+#==============================================================================
+
+import json
+import math
+import os
+
+from Base import Base
+from inputData import InputData
+from shellMesh import ShellMesh
+
+class ConvergenceStudy(Base):
+
+    # seeds of the mesh; maxElement is not used by the model builders
+    SEEDS = ("lengthSeed", "quadHeightSeed", "quadWidthSeed", "tFlangeSeed", "tWebSeed")
+
+    # backend   : solver backend (see parameterSweep.py)
+    # data      : InputData with the seeds of the first level
+    # tolerance : relative tolerance of the maximum deflection
+    # ratio     : refinement ratio of the seeds between two levels
+    # maxLevels : maximum number of solver runs, at least 3 for an estimate
+    # family    : name of the profile family in the seed file, default data.name
+    def __init__(self, backend, data, tolerance = 0.01, ratio = 2., maxLevels = 5,
+                 family = None, seedFile = "meshSeeds.json", cpus = 1):
+        Base.__init__(self)
+        self.backend   = backend
+        self.data      = data
+        self.tolerance = tolerance
+        self.ratio     = ratio
+        self.maxLevels = maxLevels
+        self.family    = data.name if family is None else family
+        self.seedFile  = seedFile
+        self.cpus      = cpus
+        self.levels    = []     # list of {"seeds", "elements", "maxDisp"}
+        self.estimate  = None
+
+    # seeds of a refinement level
+    def getSeeds(self, level):
+        seeds = {}
+        for key in ConvergenceStudy.SEEDS:
+            seeds[key] = max(1, int(round(getattr(self.data, key) * self.ratio**level)))
+        # the width seed stays even, so the bottom flange halves and the fiber match,
+        # the length seed stays even, so there is a node at midspan
+        seeds["quadWidthSeed"] += seeds["quadWidthSeed"] % 2
+        seeds["lengthSeed"]    += seeds["lengthSeed"] % 2
+        return seeds
+
+    # Richardson extrapolation of the last three levels, returns (estimate, order).
+    # The ratios of the element sizes may differ, the order p solves
+    #   (f1 - f2) / (f2 - f3) = (h1^p - h2^p) / (h2^p - h3^p)
+    def extrapolate(self):
+        f = [level["maxDisp"] for level in self.levels[-3:]]
+        h = [1. / math.sqrt(level["elements"]) for level in self.levels[-3:]]
+        if len(f) < 3 or not h[0] > h[1] > h[2]:
+            raise Exception("error: Richardson extrapolation needs three refined levels", h)
+
+        def ratio(p):
+            return (h[0]**p - h[1]**p) / (h[1]**p - h[2]**p)
+
+        # the ratio grows with p, keep the observed order plausible (0.5 to 4)
+        p = 2.
+        if (f[0] - f[1]) * (f[1] - f[2]) > 0.:
+            target = (f[0] - f[1]) / (f[1] - f[2])
+            lo, hi = 0.5, 4.
+            if target <= ratio(lo):   p = lo
+            elif target >= ratio(hi): p = hi
+            else:
+                for i in range(60):
+                    p = (lo + hi) / 2.
+                    if ratio(p) < target: lo = p
+                    else:                 hi = p
+        r = h[1] / h[2]
+        return f[2] + (f[2] - f[1]) / (r**p - 1.), p
+
+    # relative error of a level against the estimate
+    def getError(self, level):
+        return abs(level["maxDisp"] - self.estimate) / max(abs(self.estimate), 1.e-12)
+
+    # refine until converged, returns the cheapest adequate seeds
+    def run(self):
+        self.AppendLog("convergence study of '%s', tolerance %.2f%%..." % (self.family, 100. * self.tolerance))
+        for level in range(self.maxLevels):
+            # a small ratio may round to the seeds of the last level
+            if len(self.levels) > 0 and self.getSeeds(level) == self.levels[-1]["seeds"]:
+                self.AppendLog("  level %d: seeds of the last level, skipped" % level)
+                continue
+            params = self.data.getParameters()
+            params.update(self.getSeeds(level))
+            params["name"] = "%s-Mesh%d" % (self.data.name, level)
+            data   = InputData(**params)
+            result = self.backend.solve(data, self.cpus)
+
+            elements = len(ShellMesh(data).elements)
+            self.levels.append({"seeds": self.getSeeds(level), "elements": elements,
+                                "maxDisp": result.getMaxDisp()})
+            self.AppendLog("  level %d: %6d elements, max deflection %12.6f"
+                           % (level, elements, self.levels[-1]["maxDisp"]))
+            if len(self.levels) < 3: continue
+
+            self.estimate, order = self.extrapolate()
+            error = self.getError(self.levels[-1])
+            self.AppendLog("  estimate %12.6f (order %.2f), error of level %d: %.3f%%"
+                           % (self.estimate, order, level, 100. * error))
+            if error < self.tolerance: break
+        else:
+            self.AppendLog("  not converged after %d levels" % self.maxLevels)
+
+        # the cheapest level within the tolerance
+        adequate = self.levels[-1]
+        if self.estimate is not None:
+            for level in self.levels:
+                if self.getError(level) < self.tolerance:
+                    adequate = level
+                    break
+        self.record(adequate)
+        return adequate["seeds"]
+
+    # store the seeds of the family in the seed file
+    def record(self, level):
+        entries = {}
+        if os.path.exists(self.seedFile):
+            f = open(self.seedFile, "r")
+            entries = json.load(f)
+            f.close()
+        entries[self.family] = {"seeds"     : level["seeds"],
+                                "elements"  : level["elements"],
+                                "maxDisp"   : level["maxDisp"],
+                                "estimate"  : self.estimate,
+                                "tolerance" : self.tolerance,
+                                "runs"      : len(self.levels)}
+        f = open(self.seedFile, "w")
+        json.dump(entries, f, indent = 2, sort_keys = True)
+        f.close()
+        self.AppendLog("  seeds of '%s': %s" % (self.family, level["seeds"]))
+
+    # recorded seeds of a family, None if not available
+    @staticmethod
+    def lookup(family, seedFile = "meshSeeds.json"):
+        if not os.path.exists(seedFile): return None
+        f = open(seedFile, "r")
+        entries = json.load(f)
+        f.close()
+        if family not in entries: return None
+        return dict((str(key), value) for key, value in entries[family]["seeds"].items())
@@ -0,0 +1,129 @@
+#==============================================================================
+# spatial index of the mesh nodes
+#
+# The nodes are sorted into a regular grid of buckets once, queries only test
+# the nodes of the buckets touched by the query region. So selecting nodes on
+# a line, a plane or in a box and finding the nearest node stays cheap when the
+# mesh seeds grow.
+#
+# usage:
+#   index  = NodeIndex(labels, coords)
+#   labels = index.onLine((0., data.quad_y, 0.), axis = 2, tol = 1.e-6)
+#==============================================================================
+
+import numpy as np
+
+class NodeIndex:
+
+    # labels : node labels (n)
+    # coords : node coordinates (n,3)
+    # size   : edge length of a bucket, by default about 4 nodes per bucket
+    def __init__(self, labels, coords, size = None):
+        self.labels = np.asarray(labels, dtype=int).ravel()
+        self.coords = np.asarray(coords, dtype=float).reshape(-1,3)
+        if len(self.labels) == 0:
+            raise Exception("error: Node index without nodes")
+
+        self.lower = self.coords.min(axis=0)
+        extent     = self.coords.max(axis=0) - self.lower
+        if size is None:
+            # a shell mesh fills a surface, not the volume of the box
+            area = extent[0]*extent[1] + extent[1]*extent[2] + extent[2]*extent[0]
+            size = np.sqrt(4. * max(area, 1.e-12) / len(self.labels))
+        self.size  = max(float(size), 1.e-9 * max(extent.max(), 1.))
+        self.shape = (extent / self.size).astype(int) + 1
+
+        # bucket of every node, sorted by bucket
+        cells       = self.getCells(self.coords)
+        keys        = self.getKeys(cells)
+        self.order  = np.argsort(keys, kind="mergesort")
+        sortedKeys  = keys[self.order]
+        self.keys, self.starts = np.unique(sortedKeys, return_index=True)
+        self.ends   = np.append(self.starts[1:], len(sortedKeys))
+
+    # bucket indices of points
+    def getCells(self, points):
+        cells = np.floor((np.asarray(points, dtype=float) - self.lower) / self.size).astype(int)
+        return np.clip(cells, 0, self.shape - 1)
+
+    # linear bucket keys
+    def getKeys(self, cells):
+        return (cells[...,0] * self.shape[1] + cells[...,1]) * self.shape[2] + cells[...,2]
+
+    # indices of the nodes in the buckets between the cells lo and hi
+    def getCandidates(self, lo, hi):
+        lo     = np.maximum(lo, 0)
+        hi     = np.minimum(hi, self.shape - 1)
+        ranges = [np.arange(lo[i], hi[i] + 1) for i in range(3)]
+        if np.prod([len(r) for r in ranges]) >= len(self.keys):
+            return np.arange(len(self.labels))
+        grid = np.stack(np.meshgrid(*ranges, indexing="ij"), axis=-1).reshape(-1,3)
+        keys = self.getKeys(grid)
+        # keep the occupied buckets only, searchsorted of an empty bucket
+        # lands on the next occupied one
+        pos  = np.searchsorted(self.keys, keys)
+        hit  = pos < len(self.keys)
+        pos  = pos[hit][self.keys[pos[hit]] == keys[hit]]
+        if len(pos) == 0: return np.zeros(0, dtype=int)
+        return self.order[np.concatenate([np.arange(self.starts[p], self.ends[p]) for p in pos])]
+
+    # indices of the nodes inside the box
+    def getBoxIndex(self, lower, upper, tol = 0.):
+        lower = np.asarray(lower, dtype=float) - tol
+        upper = np.asarray(upper, dtype=float) + tol
+        index = self.getCandidates(self.getCells(lower), self.getCells(upper))
+        c     = self.coords[index]
+        found = np.all((c >= lower) & (c <= upper), axis=1)
+        return np.sort(index[found])
+
+    # labels of the nodes inside the box
+    def inBox(self, lower, upper, tol = 0.):
+        return self.labels[self.getBoxIndex(lower, upper, tol)]
+
+    # labels of the nodes on the plane coords[axis] = value
+    def onPlane(self, axis, value, tol):
+        lower = self.lower.copy()
+        upper = self.lower + self.shape * self.size
+        lower[axis] = upper[axis] = value
+        return self.inBox(lower, upper, tol)
+
+    # labels of the nodes on the line through point parallel to the axis,
+    # optionally limited to the range [start, end] along the axis
+    def onLine(self, point, axis, tol, start = None, end = None):
+        lower = np.array(point, dtype=float)
+        upper = np.array(point, dtype=float)
+        lower[axis] = self.lower[axis] if start is None else start
+        upper[axis] = self.lower[axis] + self.shape[axis] * self.size if end is None else end
+        return self.inBox(lower, upper, tol)
+
+    # labels of the nearest nodes of the points and their distances
+    def nearest(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1,3)
+        labels = np.zeros(len(points), dtype=int)
+        dists  = np.zeros(len(points))
+        for i, point in enumerate(points):
+            cell = self.getCells(point)
+            # grow the searched block until the best node is closer than its border
+            ring = 1
+            while True:
+                lo, hi = cell - ring, cell + ring
+                index  = self.getCandidates(lo, hi)
+                if len(index) > 0:
+                    d = np.sqrt(((self.coords[index] - point)**2).sum(axis=1))
+                    j = np.argmin(d)
+                    if d[j] <= self.getMargin(point, lo, hi):
+                        labels[i], dists[i] = self.labels[index[j]], d[j]
+                        break
+                ring *= 2
+        return labels, dists
+
+    # distance of the point to the border of the block of cells lo to hi,
+    # sides at the border of the grid do not count
+    def getMargin(self, point, lo, hi):
+        margin = np.inf
+        for a in range(3):
+            if lo[a] > 0:
+                margin = min(margin, point[a] - (self.lower[a] + lo[a] * self.size))
+            if hi[a] < self.shape[a] - 1:
+                margin = min(margin, self.lower[a] + (hi[a] + 1) * self.size - point[a])
+        return margin
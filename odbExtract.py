@@ -0,0 +1,25 @@
+#==============================================================================
+# extracts the results of an odb into a ResultData npz file
+#
+# usage: abaqus python odbExtract.py -- CP1-Linear.odb
+# writes CP1-Linear-result.npz, the queries use the top face set S
+#==============================================================================
+
+import sys
+from odbAccess import openOdb
+
+from resultData import ResultData
+
+odbname = sys.argv[-1]
+odb     = openOdb(path=odbname, readOnly=True)
+
+frame    = odb.steps.values()[-1].frames[-1]
+instance = odb.rootAssembly.instances["INSTANCE"]
+
+result = ResultData()
+result.readOdbFrame(frame, instance, instance.nodeSets['S'])
+result.odbPath = odbname
+result.Save(odbname[:-4] + "-result.npz")
+result.AppendLog("  %d nodes read from '%s', max deflection %10.4f"
+                 % (len(result.labels), odbname, result.getMaxDisp()))
+odb.close()
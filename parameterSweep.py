@@ -0,0 +1,400 @@
+#==============================================================================
+# parametric sweep runner for the Quadrilateral Triple-T profile
+#
+# The sweep expands lists of InputData parameters into single runs and
+# executes them concurrently in a process pool. The number of simultaneous
+# solver jobs is limited by a job cap, by the host cores and by the available
+# Abaqus license tokens. Finished runs are appended to a state file, so an
+# interrupted sweep can be resumed.
+#
+# usage:
+#   sweep = ParameterSweep(AbaqusBackend(), maxJobs = 4, cpusPerJob = 2)
+#   sweep.addCases(a_q = [120, 140, 160], load = [-20., -29.])
+#   sweep.run()
+#
+# With cpusPerJob = None the cores of a job are chosen by the SolverTuner
+# from the size of the largest model and the number of parallel jobs, so
+# a few large models share the host and many small ones run side by side.
+# The open solver settings of every job (cores, domains, memory) are tuned
+# for the number of parallel jobs and passed with the parameters.
+#==============================================================================
+
+import hashlib
+import itertools
+import json
+import os
+import random
+import subprocess
+import time
+from multiprocessing import Pool, Queue, cpu_count
+
+import numpy as np
+
+from Base import Base
+from inputData import InputData
+from inpWriter import InpWriter
+from logWriter import LogListener, QueueLogWriter
+from resultData import ResultData
+from solverTuning import SolverTuner
+
+# number of abaqus license tokens needed for a job on ncpus cores
+def licenseTokens(ncpus):
+    return int(5 * ncpus ** 0.422)
+
+# stable id of a parameter set
+def caseId(params):
+    text = json.dumps(params, sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+#------------------------------------------------------------------------------
+# solver backends
+# a backend builds and solves the model of an InputData object and returns
+# the results as a ResultData object.
+#------------------------------------------------------------------------------
+class SolverBackend:
+    name = "base"
+
+    # solve the model, cpus is the number of cores assigned to the job
+    def solve(self, data, cpus = 1):
+        raise NotImplementedError("error: solve is not implemented for backend '%s'" % self.name)
+
+# runs abaqusQuadBeam.py in a CAE kernel without GUI
+class AbaqusBackend(SolverBackend):
+    name = "abaqus"
+
+    # headless: the script skips the viewport and the image export,
+    #           the plots are rendered later by resultPlot.py
+    def __init__(self, command = "abaqus", script = "abaqusQuadBeam.py", workdir = ".", headless = False):
+        self.command  = command
+        self.script   = os.path.abspath(script)
+        self.workdir  = workdir
+        self.headless = headless
+
+    def solve(self, data, cpus = 1):
+        # the request file is passed to the script after the "--" separator
+        request = os.path.join(self.workdir, data.jobname + "-request.json")
+        f = open(request, "w")
+        json.dump({"params": data.getParameters(), "cpus": cpus, "headless": self.headless}, f)
+        f.close()
+
+        args = [self.command, "cae", "noGUI=%s" % self.script, "--", os.path.abspath(request)]
+        code = subprocess.call(args, cwd = self.workdir)
+        if code != 0:
+            raise Exception("error: abaqus returned %d for job '%s'" % (code, data.jobname))
+
+        result = ResultData()
+        result.Load(os.path.join(self.workdir, data.jobname + "-result.npz"))
+        result.odbPath = os.path.abspath(os.path.join(self.workdir, data.jobname + ".odb"))
+        return result
+
+# writes the input deck without CAE and submits it to the solver,
+# the results are extracted from the odb by odbExtract.py
+class InpBackend(SolverBackend):
+    name = "inp"
+
+    def __init__(self, command = "abaqus", workdir = "."):
+        self.command = command
+        self.workdir = workdir
+        self.extract = os.path.abspath(os.path.join(os.path.dirname(__file__), "odbExtract.py"))
+
+    def solve(self, data, cpus = 1):
+        InpWriter(data).write(os.path.join(self.workdir, data.jobname + ".inp"))
+
+        # the solver settings of the data, the open ones are tuned for the assigned cores
+        settings = SolverTuner().tune(data, cpus)
+        args = [self.command, "job=%s" % data.jobname, "input=%s.inp" % data.jobname,
+                "cpus=%(numCpus)d" % settings, "domains=%(numDomains)d" % settings,
+                "memory=%d%%" % int(round(settings["memory"]))]
+        if settings["mpMode"] != data.DEFAULT:
+            args.append("mp_mode=%s" % ("threads", "mpi")[settings["mpMode"] - 1])
+        args.append("interactive")
+        code = subprocess.call(args, cwd = self.workdir)
+        if code != 0:
+            raise Exception("error: abaqus returned %d for job '%s'" % (code, data.jobname))
+        odbname = os.path.abspath(os.path.join(self.workdir, data.jobname + ".odb"))
+        code = subprocess.call([self.command, "python", self.extract, "--", odbname], cwd = self.workdir)
+        if code != 0:
+            raise Exception("error: Result extraction failed for job '%s'" % data.jobname)
+
+        result = ResultData()
+        result.Load(os.path.join(self.workdir, data.jobname + "-result.npz"))
+        result.odbPath = odbname
+        result.expandSymmetry(data)
+        return result
+
+# solves the model in process with the local sparse shell solver
+class LocalBackend(SolverBackend):
+    name = "local"
+
+    def solve(self, data, cpus = 1):
+        # scipy is only needed for the local backend
+        from shellSolver import ShellSolver
+        return ShellSolver(data).solve()
+
+# stand-in for the solver: deflection of a simply supported box beam.
+# the delay emulates the solver time, failRate injects random failures,
+# so the scheduler can be tested and benchmarked without Abaqus.
+class FakeBackend(SolverBackend):
+    name = "fake"
+
+    def __init__(self, delay = 0.1, failRate = 0.):
+        self.delay    = delay
+        self.failRate = failRate
+
+    def solve(self, data, cpus = 1):
+        time.sleep(self.delay / cpus)
+        if random.random() < self.failRate:
+            raise Exception("error: fake solver failure for job '%s'" % data.jobname)
+
+        # thin walled box: 2 webs and 2 flanges
+        a = 2. * data.qs
+        h = 2. * data.quad_y
+        I = data.s_q * h**3 / 6. + a * data.s_q * h**2 / 2.
+        q = data.p1 * a     # line load of the pressure on the top face
+
+        # nodes of the fiber on the top face
+        z = np.linspace(0., data.l, data.lengthSeed + 1)
+        w = q * z * (data.l**3 - 2. * data.l * z**2 + z**3) / (24. * data.EMod * I)
+        labels = np.arange(1, len(z) + 1)
+        coords = np.column_stack((np.zeros(len(z)), np.full(len(z), data.quad_y), z))
+
+        result = ResultData()
+        result.setNodes(labels, coords)
+        result.setDisplacements(labels, np.column_stack((np.zeros(len(z)), w, np.zeros(len(z)))))
+        result.setReactions([1, len(z)], [[0., -q * data.l / 2., 0.], [0., -q * data.l / 2., 0.]])
+        return result
+
+#------------------------------------------------------------------------------
+# worker: runs a single case with retries
+#------------------------------------------------------------------------------
+# the workers log through a queue into the log file of the sweep
+def _initWorker(queue, level):
+    Base.SetLogWriter(QueueLogWriter(queue, level))
+
+def _runCase(args):
+    backend, id, params, retries, cpus = args
+
+    record = {"id": id, "params": params, "status": "failed", "attempts": 0, "error": ""}
+    result = None
+    start  = time.time()
+    while record["attempts"] <= retries:
+        record["attempts"] += 1
+        try:
+            data   = InputData(**params)
+            result = backend.solve(data, cpus)
+            record["status"]  = "ok"
+            record["error"]   = ""
+            record["maxDisp"] = result.getMaxDisp()
+            record["sumRFo"]  = list(result.sumRFo)
+            # the results are kept for the later plots (resultPlot.py),
+            # backends without a result file are saved by the sweep
+            if result.filename is None:
+                result.Save(data.jobname + "-result.npz")
+                result.filename = os.path.abspath(data.jobname + "-result.npz")
+            record["resultFile"] = result.filename
+            if result.approximate: record["approximate"] = True
+            break
+        except Exception as e:
+            record["error"] = str(e)
+    record["time"] = time.time() - start
+    return record, result
+
+#------------------------------------------------------------------------------
+# the sweep
+#------------------------------------------------------------------------------
+class ParameterSweep(Base):
+
+    # backend       : solver backend
+    # maxJobs       : maximum number of simultaneous solver jobs
+    # cpusPerJob    : cores used by each job, None: chosen by the SolverTuner
+    # tokens        : available license tokens (None: unlimited)
+    # retries       : number of retries of a failed case
+    # stateFile     : file of finished cases, used to resume the sweep
+    # cache         : ResultCache, cached cases are not solved again
+    # superpose     : cases of the linear step which differ in the load only
+    #                 are solved once for a unit load and scaled
+    def __init__(self, backend, maxJobs = 1, cpusPerJob = 1, tokens = None,
+                 retries = 1, stateFile = "sweep.state", cache = None, superpose = False):
+        Base.__init__(self)
+        self.backend    = backend
+        self.maxJobs    = maxJobs
+        self.cpusPerJob = cpusPerJob
+        self.tuneCpus   = cpusPerJob is None
+        self.tokens     = tokens
+        self.retries    = retries
+        self.stateFile  = stateFile
+        self.cache      = cache
+        self.superpose  = superpose
+        self.cases      = []    # list of (id, params)
+        self.records    = {}    # finished cases: id -> record
+        self.elapsed    = 0.
+        self.finished   = 0     # cases finished in the last run
+
+    # add the cartesian product of the given parameter lists,
+    # single values are used for every case
+    def addCases(self, **ranges):
+        keys   = sorted(ranges.keys())
+        values = []
+        for key in keys:
+            value = ranges[key]
+            if not isinstance(value, (list, tuple)): value = [value]
+            values.append(value)
+
+        for combination in itertools.product(*values):
+            params = dict(zip(keys, combination))
+            id     = caseId(params)
+            # every case gets its own job name
+            params["name"] = "%s-%s" % (params.get("name", "SW"), id[:8])
+            self.cases.append((id, params))
+        self.AppendLog("%d cases in sweep" % len(self.cases))
+
+    # add a case for every InputData object, e.g. of a profile catalog
+    def addProfiles(self, profiles):
+        for data in profiles:
+            params = data.getParameters()
+            id     = caseId(params)
+            params["name"] = "%s-%s" % (params["name"], id[:8])
+            self.cases.append((id, params))
+        self.AppendLog("%d cases in sweep" % len(self.cases))
+
+    # cores of the jobs: the cores of the largest case, if the host is shared
+    # by min(maxJobs, cases) jobs
+    def getJobCpus(self, cases):
+        tuner = SolverTuner(concurrentJobs = min(self.maxJobs, len(cases)))
+        return max([tuner.getCpus(InputData(**params)) for id, params in cases] or [1])
+
+    # parameters of a job with the tuned solver settings
+    def getJobParams(self, tuner, params):
+        return dict(params, **tuner.tune(InputData(**params), self.cpusPerJob))
+
+    # number of jobs which may run at the same time
+    def getSlots(self):
+        slots = min(self.maxJobs, max(1, cpu_count() // self.cpusPerJob))
+        if self.tokens is not None:
+            slots = min(slots, self.tokens // licenseTokens(self.cpusPerJob))
+        if slots < 1:
+            raise Exception("error: Not enough license tokens for a job on %d cpus" % self.cpusPerJob,
+                            self.tokens)
+        return slots
+
+    # read the finished cases of a previous run
+    def loadState(self):
+        self.records = {}
+        if not os.path.exists(self.stateFile): return
+        f = open(self.stateFile, "r")
+        for line in f:
+            if len(line.strip()) == 0: continue
+            record = json.loads(line)
+            self.records[record["id"]] = record
+        f.close()
+
+    # run all cases which are not finished yet
+    def run(self):
+        self.loadState()
+        pending = [(id, params) for (id, params) in self.cases
+                   if self.records.get(id, {}).get("status") != "ok"]
+        if self.tuneCpus: self.cpusPerJob = self.getJobCpus(pending)
+        slots   = self.getSlots()
+        tuner   = SolverTuner(concurrentJobs = slots)
+        self.AppendLog("run %d of %d cases, %d parallel jobs on %d cpus each..."
+                       % (len(pending), len(self.cases), slots, self.cpusPerJob))
+
+        self.finished = 0
+        start = time.time()
+        state = open(self.stateFile, "a")
+        pool  = None
+        try:
+            # take the cached cases from the cache
+            tasks  = []
+            groups = self.getGroups(pending)
+            for id, (params, members) in groups.items():
+                result = None
+                if self.cache is not None: result = self.cache.get(InputData(**params), self.backend.name)
+                if result is None:
+                    params = self.getJobParams(tuner, params)
+                    tasks.append((self.backend, id, params, self.retries, params["numCpus"]))
+                    continue
+                record = {"id": id, "params": params, "status": "ok", "attempts": 0, "error": "",
+                          "cached": True, "time": 0., "maxDisp": result.getMaxDisp(),
+                          "sumRFo": list(result.sumRFo), "resultFile": result.filename}
+                if result.approximate: record["approximate"] = True
+                self.storeGroup(state, members, record)
+            if len(tasks) < len(pending):
+                self.AppendLog("  %d solver jobs for %d cases" % (len(tasks), len(pending)))
+
+            # write the buffer before forking, the workers log through the queue
+            writer = Base.GetLogWriter()
+            writer.flush()
+            queue    = Queue()
+            listener = LogListener(queue, writer)
+            listener.start()
+            pool = Pool(slots, _initWorker, (queue, writer.level))
+            for record, result in pool.imap_unordered(_runCase, tasks):
+                if result is not None and self.cache is not None:
+                    self.cache.put(InputData(**record["params"]), result, result.odbPath, self.backend.name)
+                self.storeGroup(state, groups[record["id"]][1], record)
+        finally:
+            state.close()
+            if pool is not None:
+                pool.close()
+                pool.join()
+                listener.stop()
+        self.elapsed = time.time() - start
+        return self.getReport()
+
+    # group the cases to solver jobs: id -> (params, members)
+    # members: list of (id, params, load factor) of the cases of the job.
+    # with superposition the cases of the linear step which differ in the load
+    # only share a job with unit load, otherwise every case is a job
+    def getGroups(self, cases):
+        groups = {}
+        for (id, params) in cases:
+            data = InputData(**params)
+            if not self.superpose or data.steptype != data.LINEAR:
+                groups[id] = (params, [(id, params, 1.)])
+                continue
+
+            shared  = dict((key, value) for key, value in params.items() if key not in ("name", "load"))
+            groupId = caseId(dict(shared, load = 1.))
+            if groupId not in groups:
+                unit = dict(shared, load = 1., name = "SW-%s-Unit" % groupId[:8])
+                groups[groupId] = (unit, [])
+            groups[groupId][1].append((id, params, float(data.load)))
+        return groups
+
+    # store the finished cases of a job, the results are scaled by the load factors.
+    # the members share the result file of the job, scaled by loadFactor
+    def storeGroup(self, state, members, record):
+        for id, params, factor in members:
+            member = dict(record, id = id, params = params, loadFactor = factor)
+            if record["status"] == "ok":
+                member["maxDisp"] = factor * record["maxDisp"]
+                member["sumRFo"]  = [factor * value for value in record["sumRFo"]]
+            self.storeRecord(state, member)
+
+    # store a finished case at once, so the sweep can be resumed
+    def storeRecord(self, state, record):
+        state.write(json.dumps(record) + "\n")
+        state.flush()
+        self.records[record["id"]] = record
+        self.finished += 1
+        if record["status"] == "ok":
+            self.AppendLog("  %s: max deflection %10.4f (%d attempts, %.2fs)"
+                           % (record["params"]["name"], record["maxDisp"], record["attempts"], record["time"]))
+        else:
+            self.AppendLog("  %s: failed after %d attempts: %s"
+                           % (record["params"]["name"], record["attempts"], record["error"]))
+
+    # summary of the sweep
+    def getReport(self):
+        ids    = [id for (id, params) in self.cases]
+        done   = [id for id in ids if self.records.get(id, {}).get("status") == "ok"]
+        failed = [id for id in ids if self.records.get(id, {}).get("status") == "failed"]
+        report = {"cases"   : len(ids),
+                  "done"    : len(done),
+                  "failed"  : len(failed),
+                  "elapsed" : self.elapsed,
+                  "throughput": self.finished / self.elapsed if self.elapsed > 0. else 0.}
+        self.AppendLog("sweep: %(done)d of %(cases)d cases done, %(failed)d failed, %(throughput).2f cases/s" % report)
+        if self.cache is not None: report["cache"] = self.cache.getReport()
+        return report
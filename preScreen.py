@@ -0,0 +1,182 @@
+#==============================================================================
+# vectorized analytical pre-screening of Triple-T profiles
+#
+# Every parameter is held as a NumPy array with one entry per candidate
+# geometry, so thousands of profiles are checked and evaluated at once before
+# any FE job is submitted. The rules of InputData.Check are applied column
+# wise, the section is treated as thin walled (midline of the sketch) and the
+# midspan deflection is taken from beam theory. Like the FE models (see
+# ShellMesh.getThickness) every wall has the thickness s_q, s_t only enters
+# the check and the position of the T flanges.
+#
+# usage:
+#   screen = ProfileScreen(a_q = numpy.arange(100, 200, 2), b_q = 60.)
+#   mask   = screen.screen(maxDeflection = 10.)
+#==============================================================================
+
+import numpy as np
+
+from Base import Base
+from inputData import InputData
+
+# error codes of the check, in the order of InputData.Check
+CHECK_OK        = 0
+CHECK_MESSAGES  = {1: "Invalid flange length for T section",
+                   2: "Invalid web length for T section",
+                   3: "Invalid T section thickness",
+                   4: "Flange length must be greater than T section thickness",
+                   5: "Web length must be greater than T section thickness",
+                   6: "Invalid width for quadrilateral section",
+                   7: "Invalid height for quadrilateral section",
+                   8: "Both length and width of the quadrilateral section must be greater than it's thickness",
+                   9: "The T-beams collide each other",
+                   10: "Maximum deflection exceeded",
+                   11: "Maximum mass exceeded"}
+
+# midspan deflection factors w(l/2) = c * q * l^4 / (E * I)
+SIMPLY_SUPPORTED = 5. / 384.
+PROPPED          = 1. / 192.     # clamped at z = 0, simply supported at z = l
+                                 # (the maximum, at z = 0.5785 l, is 1/185)
+
+class ProfileScreen(Base):
+
+    # parameters held as arrays
+    FIELDS = ("a_q", "b_q", "s_q", "b_t", "h_t", "s_t", "l", "EMod", "nue", "rho", "load")
+
+    # arrays   : a value or an array for each parameter in FIELDS
+    # base     : InputData object which provides the missing parameters
+    def __init__(self, base = None, **arrays):
+        Base.__init__(self)
+        if base is None: base = InputData()
+
+        for key in arrays:
+            if key not in ProfileScreen.FIELDS:
+                raise Exception("error: Unknown screening parameter", key)
+        values = [np.asarray(arrays.get(key, getattr(base, key)), dtype=float)
+                  for key in ProfileScreen.FIELDS]
+        values = np.broadcast_arrays(*values)
+        for key, value in zip(ProfileScreen.FIELDS, values):
+            setattr(self, key, np.array(value, dtype=float).ravel())
+
+        self.size  = len(self.a_q)
+        self.codes = None       # result of the last screening
+        self.calcHelpers()
+
+    # create the screen from a list of InputData objects
+    @staticmethod
+    def fromProfiles(profiles):
+        arrays = {}
+        for key in ProfileScreen.FIELDS:
+            arrays[key] = [getattr(p, key) for p in profiles]
+        return ProfileScreen(base = profiles[0], **arrays)
+
+    # calculate helper variables, see InputData.calcHelpers
+    def calcHelpers(self):
+        self.qs      = (self.a_q - self.s_q) / 2.
+        self.lower_y = (self.b_q / 2.) + self.h_t - (self.s_t / 2.)
+        self.quad_y  = (self.b_q / 2.) - (self.s_q / 2.)
+        self.p1      = self.load * 1.e3 / (self.l * (self.b_t + self.a_q))
+
+    # check the input data, returns an error code per profile (0: no error)
+    def Check(self):
+        dmin  = 0.1     # minimum length
+        rules = ((1, self.b_t < dmin),
+                 (2, self.h_t < dmin),
+                 (3, self.s_t < dmin),
+                 (4, self.s_t > self.b_t),
+                 (5, self.s_t > self.h_t),
+                 (6, self.a_q < dmin),
+                 (7, self.b_q < dmin),
+                 (8, (self.s_q > self.a_q) | (self.s_q > self.b_q)),
+                 (9, ~(self.a_q >= 2 * self.b_t)))
+
+        # the first failing rule wins, like the exceptions in InputData.Check
+        codes = np.zeros(self.size, dtype=int)
+        for code, failed in reversed(rules):
+            codes[failed] = code
+        return codes
+
+    # segments of the profile midline: (x1, y1, x2, y2, thickness) arrays,
+    # the T walls get s_q like the faces of the FE models
+    def getSegments(self):
+        qs, qy, ly = self.qs, self.quad_y, self.lower_y
+        bt = self.b_t / 2.
+        segments = [(-qs,  qy,  qs,  qy, self.s_q),      # top of the quad
+                    (-qs, -qy,  qs, -qy, self.s_q),      # bottom of the quad
+                    (-qs, -qy, -qs,  qy, self.s_q),      # left side of the quad
+                    ( qs, -qy,  qs,  qy, self.s_q)]      # right side of the quad
+        for x in (-qs, 0. * qs, qs):
+            segments.append((x, -qy, x, -ly, self.s_q))            # T web
+            segments.append((x - bt, -ly, x + bt, -ly, self.s_q))  # T flange
+        return segments
+
+    # thin walled section properties, all arrays
+    #   area : cross section area [mm^2]
+    #   yc   : vertical position of the centroid [mm]
+    #   Ix   : second moment about the horizontal centroid axis [mm^4]
+    #   Iy   : second moment about the vertical axis [mm^4]
+    #   mass : mass of the profile [kg]
+    def sectionProperties(self):
+        segments = self.getSegments()
+
+        area = np.zeros(self.size)
+        sy   = np.zeros(self.size)
+        for x1, y1, x2, y2, t in segments:
+            L     = np.hypot(x2 - x1, y2 - y1)
+            area += L * t
+            sy   += L * t * (y1 + y2) / 2.
+        yc = sy / area
+
+        Ix = np.zeros(self.size)
+        Iy = np.zeros(self.size)
+        for x1, y1, x2, y2, t in segments:
+            L  = np.hypot(x2 - x1, y2 - y1)
+            dx = (x2 - x1) / L
+            dy = (y2 - y1) / L
+            xm = (x1 + x2) / 2.
+            ym = (y1 + y2) / 2. - yc
+            # own part of the inclined thin strip plus Steiner part
+            Ix += L * t * (L**2 * dy**2 + t**2 * dx**2) / 12. + L * t * ym**2
+            Iy += L * t * (L**2 * dx**2 + t**2 * dy**2) / 12. + L * t * xm**2
+
+        return {"area": area, "yc": yc, "Ix": Ix, "Iy": Iy,
+                "mass": self.rho * area * self.l}
+
+    # midspan deflection under the pressure p1 on the top face [mm]
+    def midspanDeflection(self, factor = SIMPLY_SUPPORTED, properties = None):
+        if properties is None: properties = self.sectionProperties()
+        q = self.p1 * 2. * self.qs      # line load of the top face [N/mm]
+        return factor * q * self.l**4 / (self.EMod * properties["Ix"])
+
+    # screen the profiles, returns a mask of the profiles worth an FE run.
+    # the error codes are stored in self.codes
+    def screen(self, maxDeflection = None, maxMass = None, factor = SIMPLY_SUPPORTED):
+        codes = self.Check()
+        valid = codes == CHECK_OK
+
+        # evaluate valid geometries only, invalid ones may divide by zero
+        if maxDeflection is not None or maxMass is not None:
+            properties = self.sectionProperties()
+            with np.errstate(divide = "ignore", invalid = "ignore"):
+                if maxDeflection is not None:
+                    w = self.midspanDeflection(factor, properties)
+                    codes[valid & ~(np.abs(w) <= maxDeflection)] = 10
+                if maxMass is not None:
+                    codes[valid & (codes == CHECK_OK) & ~(properties["mass"] <= maxMass)] = 11
+
+        self.codes = codes
+        mask = codes == CHECK_OK
+        self.AppendLog("screening: %d of %d profiles passed" % (np.count_nonzero(mask), self.size))
+        return mask
+
+    # error messages of the last screening: list of (index, message)
+    def getErrors(self):
+        if self.codes is None: return []
+        return [(int(i), CHECK_MESSAGES[self.codes[i]]) for i in np.nonzero(self.codes)[0]]
+
+    # parameter dictionaries of the selected profiles, e.g. for ParameterSweep.addCases
+    def getParameters(self, mask):
+        params = []
+        for i in np.nonzero(mask)[0]:
+            params.append(dict((key, float(getattr(self, key)[i])) for key in ProfileScreen.FIELDS))
+        return params
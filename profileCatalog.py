@@ -0,0 +1,108 @@
+#==============================================================================
+# streaming loader of profile catalogs
+#
+# The rows of a catalog (csv, json lines, json, see inputData.readCatalog)
+# are read in batches, converted and checked at once with the vectorized
+# rules of ProfileScreen.Check. Valid rows are handed out as InputData
+# objects by a generator, so the memory does not grow with the size of the
+# catalog. Invalid rows do not stop the loading, they are counted and
+# reported with their line number and the reason, in the order of the lines.
+#
+# usage:
+#   catalog = ProfileCatalog("profiles.csv", errorFile = "profiles-errors.jsonl")
+#   sweep.addProfiles(catalog.profiles())
+#   print(catalog.getReport())
+#==============================================================================
+
+import json
+
+from Base import Base
+from inputData import InputData, convertParameters, readCatalog
+from logWriter import DEBUG
+from preScreen import CHECK_MESSAGES, ProfileScreen
+
+class ProfileCatalog(Base):
+
+    # filename  : catalog file
+    # base      : InputData with the parameters missing in the catalog
+    # batchSize : number of rows checked at once
+    # errorFile : json lines file of the invalid rows, if not None
+    # maxErrors : number of errors kept in memory
+    def __init__(self, filename, base = None, batchSize = 1000, errorFile = None, maxErrors = 100):
+        Base.__init__(self)
+        self.filename  = filename
+        self.base      = InputData() if base is None else base
+        self.batchSize = batchSize
+        self.errorFile = errorFile
+        self.maxErrors = maxErrors
+        self.rows      = 0      # number of read rows
+        self.valid     = 0      # number of valid rows
+        self.errors    = []     # the first maxErrors errors: {"line", "name", "error"}
+        self.invalid   = 0      # number of invalid rows
+
+    # record the error of a row
+    def addError(self, line, name, error, f):
+        self.invalid += 1
+        record = {"line": line, "name": name, "error": error}
+        if len(self.errors) < self.maxErrors: self.errors.append(record)
+        if f is not None: f.write(json.dumps(record) + "\n")
+        self.AppendLog("  line %d (%s): %s" % (line, name, error), DEBUG)
+
+    # check a batch of (line, name, params, conversion error), yields the
+    # InputData of the valid rows, the errors are recorded in the order of the lines
+    def checkBatch(self, batch, f):
+        if len(batch) == 0: return
+        converted = [params for line, name, params, error in batch if params is not None]
+        codes     = iter([])
+        if len(converted) > 0:
+            arrays = {}
+            for key in ProfileScreen.FIELDS:
+                arrays[key] = [params.get(key, getattr(self.base, key)) for params in converted]
+            codes = iter(ProfileScreen(base = self.base, **arrays).Check())
+
+        defaults = self.base.getParameters()
+        for line, name, params, error in batch:
+            if params is None:
+                self.addError(line, name, error, f)
+                continue
+            code = next(codes)
+            if code != 0:
+                self.addError(line, name, CHECK_MESSAGES[code], f)
+                continue
+            values = dict(defaults)
+            values["name"] = "%s-%d" % (self.base.name, line)
+            values.update(params)
+            # the geometry is checked by the batch already
+            try:
+                data = InputData(check = False, **values)
+            except Exception as e:
+                self.addError(line, values["name"], str(e), f)
+                continue
+            self.valid += 1
+            yield data
+
+    # generator of the InputData objects of the valid rows
+    def profiles(self):
+        self.AppendLog("load profile catalog '%s'..." % self.filename)
+        f = open(self.errorFile, "w") if self.errorFile is not None else None
+        try:
+            batch = []
+            for line, row in readCatalog(self.filename):
+                self.rows += 1
+                try:
+                    batch.append((line, row.get("name"), convertParameters(row), None))
+                except Exception as e:
+                    batch.append((line, row.get("name"), None, str(e)))
+                if len(batch) >= self.batchSize:
+                    for data in self.checkBatch(batch, f): yield data
+                    batch = []
+            for data in self.checkBatch(batch, f): yield data
+        finally:
+            if f is not None: f.close()
+            self.AppendLog("catalog '%s': %d rows, %d valid, %d invalid"
+                           % (self.filename, self.rows, self.valid, self.invalid))
+
+    # counters of the loading
+    def getReport(self):
+        return {"rows": self.rows, "valid": self.valid, "invalid": self.invalid,
+                "errors": self.errors}
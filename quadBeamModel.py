@@ -0,0 +1,421 @@
+#==============================================================================
+# model of the Quadrilateral Triple-T profile in the CAE kernel
+#
+# The script abaqusQuadBeam.py split into named stages. Every stage is
+# measured by a StageTimer (wall time, cpu time, peak memory), the counts
+# of nodes and elements are added to the report. The points, faces and
+# edges are looked up with the probes of the geometry table (geometry.py),
+# every lookup is done once. The build is incremental: a stage is only
+# rebuilt, if its InputData fields or an upstream stage changed since the
+# last build of the model (STAGES), so a load or material change keeps the
+# part and the mesh. A long-lived kernel
+# (caeWorker.py) can build, submit and postprocess many models without
+# paying the kernel startup and the module imports for every run. In
+# headless mode the viewport is not touched, the deflection plots are
+# rendered later from the result files (resultPlot.py):
+#   model  = QuadBeamModel(data, numCpus)     (numCpus None: auto-tuned)
+#   model.build()
+#   model.submit()
+#   result = model.postprocess()
+#   model.exportImage()
+#   model.timer.Save(data.jobname + "-timing.json")
+#==============================================================================
+
+import hashlib
+import json
+import os
+
+from abaqus import *                # from the main library
+from caeModules import *            # import the modules
+from abaqusConstants import *       # constants we need
+
+from Base import Base
+from logWriter import DEBUG
+from resultData import ResultData
+from nodeIndex import NodeIndex
+from geometry import QUAD, TSEC, getGeometry
+from stageTimer import StageTimer
+from solverTuning import SolverTuner
+
+# open odb of a job, an odb already open in the session is reused
+def openOdb(odbname):
+    odbname = os.path.abspath(odbname)
+    if odbname in session.odbs.keys(): return session.odbs[odbname]
+    return session.openOdb(name=odbname)
+
+# close the odb of a job, if it is open in the session
+def closeOdb(odbname):
+    odbname = os.path.abspath(odbname)
+    if odbname in session.odbs.keys(): session.odbs[odbname].close()
+
+# delete an item of a repository (models, jobs, loads, ...), if available
+def deleteItem(repository, name):
+    if name in repository.keys(): del repository[name]
+
+# last build of every model: model name -> (fingerprints, state, counts).
+# reload() runs the module in its old namespace, so the builds survive the
+# reload of abaqusQuadBeam.py and a script run in an open session reuses them
+try:
+    BUILDS
+except NameError:
+    BUILDS = {}
+
+class QuadBeamModel(Base):
+
+    # stages of the model build: (stage, method, InputData fields, upstream stages).
+    # A stage is rebuilt, if one of its fields or an upstream stage changed,
+    # a change of the cross section or the length creates a new model.
+    STAGES = (("database", "createDatabase", ("a_q", "b_q", "s_q", "b_t", "h_t", "s_t", "l"), ()),
+              ("sketch",   "createSketch",   (), ("database",)),
+              ("part",     "createPart",     (), ("sketch",)),
+              ("material", "createMaterial", ("EMod", "nue", "s_q", "s_t"), ("part",)),
+              ("sections", "assignSections", (), ("part",)),
+              ("seeds",    "createSeeds",    ("quadHeightSeed", "quadWidthSeed", "tFlangeSeed",
+                                              "tWebSeed", "lengthSeed"), ("part",)),
+              ("mesh",     "createMesh",     (), ("seeds",)),
+              ("sets",     "createSets",     (), ("mesh",)),
+              ("step",     "createStep",     ("steptype",), ("database",)),
+              ("loads",    "createLoads",    ("p1",), ("sets", "step")),
+              ("job",      "createJob",      ("jobname", "numCpus", "numDomains", "memory", "mpMode"),
+                                                 ("loads",)))
+
+    # objects of the stages, taken over from the last build of a model
+    STATE = ("myModel", "mySketch", "myPart", "facesQuad", "facesT", "myInstance",
+             "pressureSurface", "bcFixedAllSet", "bcFixedYSet", "myJob")
+
+    # last build of every model, see BUILDS
+    builds = BUILDS
+
+    # data      : InputData of the model
+    # numCpus   : cores assigned to the job, None: the cores of the host.
+    #             The solver settings are chosen by the SolverTuner
+    # timer     : StageTimer of the stages, a new one if None
+    # modelName : name of the model in the mdb, default data.name. Runs with
+    #             the same model name reuse the unchanged stages of the model
+    # headless  : no viewport and no image export, the plots are rendered
+    #             later from the result files (resultPlot.py)
+    def __init__(self, data, numCpus = None, timer = None, modelName = None, headless = False):
+        Base.__init__(self, data.name + ".log")
+        self.data      = data
+        self.numCpus   = numCpus
+        self.settings  = SolverTuner().tune(data, numCpus)
+        self.timer     = StageTimer() if timer is None else timer
+        self.geometry  = getGeometry(data)
+        self.modelName = data.name if modelName is None else modelName
+        self.headless  = headless
+
+    # fingerprints of the stages: the stage fields and the upstream fingerprints
+    def getFingerprints(self):
+        values = self.settings
+        fingerprints = {}
+        for name, method, fields, upstream in QuadBeamModel.STAGES:
+            key = [[field, values.get(field, getattr(self.data, field, None))] for field in fields]
+            key += [fingerprints[stage] for stage in upstream]
+            fingerprints[name] = hashlib.sha1(json.dumps([name, key]).encode("utf-8")).hexdigest()
+        return fingerprints
+
+    # build the changed stages of the model, returns the job
+    def build(self):
+        fingerprints = self.getFingerprints()
+        last = QuadBeamModel.builds.get(self.modelName)
+        if last is None or self.modelName not in mdb.models.keys(): last = ({}, {}, {})
+        self.__dict__.update(last[1])
+        self.timer.counts.update(last[2])
+
+        for name, method, fields, upstream in QuadBeamModel.STAGES:
+            with self.timer.stage(name) as record:
+                if last[0].get(name) == fingerprints[name]:
+                    record["reused"] = True
+                else:
+                    getattr(self, method)()
+            # the size of the model in the stages after the mesh
+            record.update(self.timer.counts)
+
+        state = dict((key, getattr(self, key)) for key in QuadBeamModel.STATE if hasattr(self, key))
+        QuadBeamModel.builds[self.modelName] = (fingerprints, state, dict(self.timer.counts))
+        return self.myJob
+
+    def createDatabase(self):
+        # project name
+        prjname = self.modelName
+
+        # create the database
+        self.AppendLog("create database '%s'..." % prjname)
+        try:
+            if mdb.models[prjname]:
+                print("Model: \"%s\" is already available. Deleting it and creating again..." % mdb.models[prjname].name)
+                del mdb.models[prjname]
+                myModel = mdb.Model(name=prjname)
+        except KeyError:
+            myModel = mdb.Model(name=prjname)
+        self.myModel = myModel
+
+    def createSketch(self):
+        data, prjname, myModel = self.data, self.modelName, self.myModel
+        # create the sketch
+        self.AppendLog("create sketch...")
+        mySketch = myModel.ConstrainedSketch(name = prjname, sheetSize=2*(data.b_q+data.h_t))
+
+        # create the lines of the geometry table
+        for point1, point2 in self.geometry.sketch:
+            mySketch.Line(point1=point1,point2=point2)
+        self.mySketch = mySketch
+
+    def createPart(self):
+        data, prjname, myModel, mySketch = self.data, self.modelName, self.myModel, self.mySketch
+        # Create Part
+        self.AppendLog("create part...")
+        myPart = myModel.Part(name = prjname, dimensionality = THREE_D,
+                              type = DEFORMABLE_BODY)
+
+        # Extrusion
+        myPart.BaseShellExtrude(sketch=mySketch, depth=data.l)
+        self.myPart = myPart
+
+    def createMaterial(self):
+        data, prjname, myModel = self.data, self.modelName, self.myModel
+        # create the material, a rebuild replaces the material and the sections
+        self.AppendLog("create material...")
+        deleteItem(myModel.sections, prjname+"-Quad-Section-Flange")
+        deleteItem(myModel.sections, prjname+"-T-Section-Flange")
+        deleteItem(myModel.materials, "Steel")
+        myMaterial = myModel.Material(name = "Steel")
+        myMaterial.Elastic(table = ( (data.EMod,data.nue), ))
+
+        # create the section data
+        self.AppendLog("create section data...")
+        myModel.HomogeneousShellSection(name = prjname+"-Quad-Section-Flange",
+                                        material = "Steel", thickness = data.s_q)
+        myModel.HomogeneousShellSection(name = prjname+"-T-Section-Flange",
+                                        material = "Steel", thickness = data.s_t)
+
+    def assignSections(self):
+        prjname, myPart = self.modelName, self.myPart
+        # assign the section data to the face of the model
+        self.AppendLog("assign section data...")
+
+        # Quadrilateral Section, the faces are looked up once and reused for the element types
+        self.facesQuad = myPart.faces.findAt(*[(probe,) for probe in self.geometry.getFaceProbes(QUAD)])
+        quadSet = myPart.Set(faces = self.facesQuad, name = "QuadSet")
+        myPart.SectionAssignment(region = quadSet, sectionName = prjname + "-Quad-Section-Flange")
+
+        # T Section
+        self.facesT = myPart.faces.findAt(*[(probe,) for probe in self.geometry.getFaceProbes(TSEC)])
+        tSet = myPart.Set(faces = self.facesT, name = "TSet")
+        myPart.SectionAssignment(region = tSet, sectionName = prjname + "-Quad-Section-Flange")
+
+    def createSeeds(self):
+        data, myPart = self.data, self.myPart
+        # create the mesh
+        self.AppendLog("create mesh...")
+        # select the element type
+        elemType1 = mesh.ElemType(elemCode=S4R)
+        elemType2 = mesh.ElemType(elemCode=S3)
+
+        # assign the element type
+        myPart.setElementType(regions=(self.facesQuad,), elemTypes=(elemType1,elemType2))
+        myPart.setElementType(regions=(self.facesT,), elemTypes=(elemType1,elemType2))
+
+        # seed the edges of the geometry table, one lookup per seed and divisor
+        for seed, edges in sorted(self.geometry.edges.items()):
+            for divisor in sorted(set(divisor for divisor, probe in edges)):
+                seedEdges = myPart.edges.findAt(*[(probe,) for d, probe in edges if d == divisor])
+                myPart.seedEdgeByNumber(edges=seedEdges, number=getattr(data, seed) // divisor, constraint=FIXED)
+
+        self.AppendLog("  quadrilateral section height seed: %d" % data.quadHeightSeed)
+        self.AppendLog("  quadrilateral section width seed: %d" % data.quadWidthSeed)
+        self.AppendLog("  T section web seed   : %d" % data.tWebSeed)
+        self.AppendLog("  T section flange seed   : %d" % data.tFlangeSeed)
+        self.AppendLog("  length seed: %d" % data.lengthSeed)
+
+    def createMesh(self):
+        myPart = self.myPart
+        # Meshing, the mesh of a former build is deleted first
+        if len(myPart.nodes) > 0: myPart.deleteMesh()
+        myPart.generateMesh()
+        nodes = myPart.nodes
+        self.AppendLog("  total number of nodes: %d" % len(nodes))
+        self.timer.counts["nodes"]    = len(nodes)
+        self.timer.counts["elements"] = len(myPart.elements)
+
+    def createSets(self):
+        myModel, myPart, geometry = self.myModel, self.myPart, self.geometry
+        nodes = myPart.nodes
+        # spatial index of the mesh nodes, built once for all node selections
+        nodeLabels = [node.label for node in nodes]
+        nodeCoords = [node.coordinates for node in nodes]
+        index = NodeIndex(nodeLabels, nodeCoords)
+        eps = 1.e-6
+
+        # nodes: container for meshnodes
+        webNodes = {}
+        coordinates = dict(zip(nodeLabels, nodeCoords))
+
+        self.AppendLog("--no -----x---- -----y---- -----z----", DEBUG)
+        for label in index.onLine(geometry.getFiber(), axis = 2, tol = eps):
+            x, y, z = coordinates[label]
+            self.AppendLog("%4d %10.3f %10.3f %10.3f" % (label, x, y, z), DEBUG)
+            webNodes[label] = (x, y, z)
+        self.AppendLog("  %d web nodes found" % len(webNodes))
+
+        # create the instance from the part, the instance of a former build
+        # follows the new mesh of the part
+        self.AppendLog("create instance...")
+        rootAssm = myModel.rootAssembly
+        if 'INSTANCE' in rootAssm.instances.keys():
+            myInstance = rootAssm.instances['INSTANCE']
+            rootAssm.regenerate()
+        else:
+            myInstance = rootAssm.Instance(name='INSTANCE', part=myPart, dependent=ON)
+
+        # surface on which the pressure is applied
+        topFaces = myInstance.faces.findAt(*[(probe,) for probe in geometry.getFaceProbes(names = ("top",))])
+        pressureSurface = rootAssm.Surface(name = "pressureSurface", side2Faces = topFaces)
+
+        # sets containing the nodes at the vertices on which boundary conditions are applied,
+        # every vertex must be a mesh node
+        bcSets = {}
+        for name in ("bcFixedAll", "bcFixedY", "bcFixedXZ"):
+            labels, dists = index.nearest(geometry.vertices[name])
+            if not (dists <= eps).all():
+                raise Exception("error: No mesh node at the vertices of set '%s'" % name, dists.max())
+            bcSets[name] = rootAssm.SetFromNodeLabels(name = name, nodeLabels = (("INSTANCE", labels.tolist()),))
+
+        #SET for finding maximum displacement: nodes of the top face
+        topLabels = index.inBox(*geometry.getTopBox(), tol = eps)
+        myPart.SetFromNodeLabels(nodeLabels = topLabels.tolist(), name='S')
+        self.myInstance      = myInstance
+        self.pressureSurface = pressureSurface
+        self.bcFixedAllSet   = bcSets["bcFixedAll"]
+        self.bcFixedYSet     = bcSets["bcFixedY"]
+
+    def createStep(self):
+        data, myModel = self.data, self.myModel
+        # the steps of a former build are deleted with their loads
+        for name in list(myModel.steps.keys()):
+            if name != 'Initial': deleteItem(myModel.steps, name)
+
+        # create a linear static step
+        if data.steptype == data.LINEAR:
+            self.AppendLog("create a linear static step...")
+            myModel.StaticStep(name = data.stepname,
+                               previous = 'Initial',
+                               description = 'static analysis')
+            # the coordinates are read from the odb with the results
+            myModel.fieldOutputRequests['F-Output-1'].setValues(variables=('S', 'E', 'U', 'RF', 'CF', 'COORD'))
+
+        # create a buckling step
+        else:
+            pass  # next lecture
+
+    def createLoads(self):
+        data, myModel = self.data, self.myModel
+        pressureSurface, bcFixedAllSet, bcFixedYSet = self.pressureSurface, self.bcFixedAllSet, self.bcFixedYSet
+        # the loads and boundary conditions of a former build are replaced
+        deleteItem(myModel.loads, 'Load1')
+        deleteItem(myModel.boundaryConditions, 'fixed all')
+        deleteItem(myModel.boundaryConditions, 'fixed y')
+
+        # create the loads
+        self.AppendLog("create loads...")
+        myModel.Pressure(name='Load1',
+                         createStepName = data.stepname,
+                         region = pressureSurface,
+                         distributionType = UNIFORM,
+                         magnitude = -data.p1,
+                         amplitude = UNSET)
+
+        # create boundary conditons
+        self.AppendLog("create BCs...")
+        myModel.DisplacementBC(name = 'fixed all',
+                               createStepName = 'Initial',
+                               region = bcFixedAllSet,
+                               u1 = 0.0,
+                               u2 = 0.0,
+                               u3 = 0.0,
+                               ur1 = 0.0,
+                               ur2 = 0.0,
+                               ur3 = 0.0)
+        myModel.DisplacementBC(name = 'fixed y',
+                               createStepName = 'Initial',
+                               region = bcFixedYSet,
+                               u1 = 0.0,
+                               u2 = 0.0,
+                               ur2 = 0.0,
+                               ur3 = 0.0)
+
+    def createJob(self):
+        data, prjname, settings = self.data, self.modelName, self.settings
+        # create the job
+        self.AppendLog("create the job on %(numCpus)d cpus, %(numDomains)d domains, %(memory).0f%% memory..." % settings)
+        deleteItem(mdb.jobs, data.jobname)
+        myJob = mdb.Job(name=data.jobname,model=prjname,description='Quadrilateral tube and triple T sections analysis',
+                        numCpus=settings["numCpus"],numDomains=settings["numDomains"],
+                        memory=int(round(settings["memory"])),memoryUnits=PERCENTAGE,
+                        multiprocessingMode=(DEFAULT, THREADS, MPI)[settings["mpMode"]])
+        self.myJob = myJob
+
+    # submit the job and wait for the solver
+    def submit(self):
+        # the solver can not overwrite an odb that is still open from a former run
+        closeOdb(self.data.jobname + ".odb")
+
+        self.AppendLog("submit and execute the job...")
+        with self.timer.stage("submit"):
+            self.myJob.submit()
+            self.myJob.waitForCompletion()
+
+    # read the results of the job, returns a ResultData object
+    # or None, if there is no postprocessing for the step type
+    def postprocess(self):
+        data = self.data
+        # analyse the linear case
+        if data.steptype != data.LINEAR: return None
+
+        with self.timer.stage("odb") as record:
+            # Setting the odb
+            odbname = data.jobname + ".odb"
+            self.AppendLog("open database '%s'..." % odbname)
+            mySession  = openOdb(odbname)
+
+            # contour plot of U2 in the viewport, skipped in headless mode
+            if not self.headless:
+                myViewport = session.viewports["Viewport: 1"]
+                myViewport.setValues(displayedObject=mySession)
+                myViewport.odbDisplay.setPrimaryVariable(variableLabel='U',outputPosition=NODAL,refinement=(COMPONENT,'U2'))
+                myViewport.odbDisplay.display.setValues(plotState=(CONTOURS_ON_DEF,))
+                myViewport.view.fitView()
+            frame = mySession.steps["Linear"].frames[-1]
+            instance = mySession.rootAssembly.instances["INSTANCE"]
+            nodes = instance.nodeSets['S']
+
+            # read all nodes from the bulk data blocks, the queries use the top face
+            result = ResultData()
+            result.readOdbFrame(frame, instance, nodes)
+            result.odbPath = os.path.abspath(odbname)
+            result.Save(data.jobname + "-result.npz")
+            record["nodes"] = len(result.labels)
+            self.AppendLog("  %d nodes read, %d on the top face" % (len(result.labels), result.selected.sum()))
+            self.AppendLog("Maximum Deflection is '%s'..." % result.getExtremes()[0])
+        return result
+
+    # export U2 displacement as .png file, nothing to do in headless mode
+    def exportImage(self):
+        if self.headless: return
+        with self.timer.stage("image"):
+            session.pngOptions.setValues(imageSize = SIZE_ON_SCREEN)
+            session.defaultViewportAnnotationOptions.setValues(title = OFF, state = OFF)
+            session.printToFile(fileName = self.data.jobname, format = PNG)
+
+    # remove the job from the database, the model is kept for the next build
+    def deleteJob(self):
+        deleteItem(mdb.jobs, self.data.jobname)
+        if self.modelName in QuadBeamModel.builds:
+            QuadBeamModel.builds[self.modelName][0].pop("job", None)
+
+    # remove the model and the job from the database,
+    # so a long-lived kernel does not collect them
+    def delete(self):
+        self.deleteJob()
+        deleteItem(mdb.models, self.modelName)
+        QuadBeamModel.builds.pop(self.modelName, None)
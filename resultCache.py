@@ -0,0 +1,130 @@
+#==============================================================================
+# content addressed cache of results
+#
+# The key is a hash of every InputData parameter which affects the solution
+# (geometry, material, seeds, step type and load). The profile name is not
+# part of the key, so a renamed but otherwise identical model is a hit too,
+# nor are the solver settings (cores, domains, memory). The name of the
+# solver backend is part of the key, the same model solved by CAE and by the
+# local solver gives two entries.
+# Floats are rounded before hashing, so near-repeats with numerical noise in
+# the parameters hit the same entry.
+#
+# Each entry is a ResultData npz file in the cache directory, the index file
+# holds size, last access and the optional odb path of every entry. The cache
+# is bounded by number of entries and bytes, the least recently used entries
+# are evicted first.
+#==============================================================================
+
+import hashlib
+import json
+import os
+import time
+
+from Base import Base
+from inputData import INTEGERS, SOLVER, InputData
+from resultData import ResultData
+
+class ResultCache(Base):
+
+    # parameters which do not affect the solution
+    IGNORED = ("name",) + SOLVER
+
+    # directory  : cache directory
+    # maxEntries : maximum number of entries
+    # maxBytes   : maximum size of the stored results
+    # digits     : significant digits of floats in the key
+    def __init__(self, directory = "cache", maxEntries = 1000, maxBytes = 500 * 1024**2, digits = 10):
+        Base.__init__(self)
+        self.directory  = directory
+        self.maxEntries = maxEntries
+        self.maxBytes   = maxBytes
+        self.digits     = digits
+        self.hits       = 0
+        self.misses     = 0
+        self.evictions  = 0
+
+        if not os.path.isdir(directory): os.makedirs(directory)
+        self.indexFile = os.path.join(directory, "index.json")
+        self.index     = {}
+        if os.path.exists(self.indexFile):
+            f = open(self.indexFile, "r")
+            self.index = json.load(f)
+            f.close()
+
+    # stable key of the model definition and the solver backend
+    # (SolverBackend.name), the results of different solvers are kept apart
+    def getKey(self, data, backend = None):
+        params = {"backend": backend}
+        for key in InputData.PARAMETERS:
+            if key in ResultCache.IGNORED: continue
+            # 120 and 120.0 are the same model, e.g. of a catalog row and a default
+            value = getattr(data, key)
+            if key in INTEGERS: value = int(value)
+            else:               value = float("%.*g" % (self.digits, float(value)))
+            params[key] = value
+        text = json.dumps(params, sort_keys = True)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    # file of an entry
+    def getFile(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    # get the cached result of the model, None if not available
+    def get(self, data, backend = None):
+        key   = self.getKey(data, backend)
+        entry = self.index.get(key)
+        if entry is None or not os.path.exists(self.getFile(key)):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entry["used"] = time.time()
+        self.saveIndex()
+
+        result = ResultData()
+        result.Load(self.getFile(key))
+        result.odbPath = entry.get("odb")
+        return result
+
+    # store the result of the model
+    def put(self, data, result, odbPath = None, backend = None):
+        key = self.getKey(data, backend)
+        result.Save(self.getFile(key))
+        self.index[key] = {"name" : data.name,
+                           "backend" : backend,
+                           "size" : os.path.getsize(self.getFile(key)),
+                           "used" : time.time(),
+                           "odb"  : odbPath}
+        self.evict()
+        self.saveIndex()
+
+    # remove the least recently used entries until the limits are met
+    def evict(self):
+        keys = sorted(self.index.keys(), key = lambda key: self.index[key]["used"])
+        size = sum(entry["size"] for entry in self.index.values())
+        while keys and (len(keys) > self.maxEntries or size > self.maxBytes):
+            key   = keys.pop(0)
+            size -= self.index[key]["size"]
+            del self.index[key]
+            if os.path.exists(self.getFile(key)): os.remove(self.getFile(key))
+            self.evictions += 1
+
+    # write the index
+    def saveIndex(self):
+        f = open(self.indexFile, "w")
+        json.dump(self.index, f)
+        f.close()
+
+    # hit/miss report
+    def getReport(self):
+        requests = self.hits + self.misses
+        report   = {"entries"   : len(self.index),
+                    "bytes"     : sum(entry["size"] for entry in self.index.values()),
+                    "hits"      : self.hits,
+                    "misses"    : self.misses,
+                    "evictions" : self.evictions,
+                    "hitRate"   : float(self.hits) / requests if requests > 0 else 0.}
+        self.AppendLog("cache: %(hits)d hits, %(misses)d misses (%(hitRate).1f%%), %(entries)d entries"
+                       % dict(report, hitRate = 100. * report["hitRate"]))
+        return report
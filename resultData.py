@@ -1,21 +1,200 @@
-from math import fabs
+#==============================================================================
+# results of a run, held as contiguous NumPy arrays
+#
+#   labels   : node labels, sorted
+#   coords   : node coordinates             (n,3)
+#   disp     : node displacements           (n,3)
+#   rfo      : node reaction forces         (n,3)
+#   selected : mask of the selected nodes (e.g. the fiber or the top face)
+#
+# The arrays are filled from the bulk data blocks of the odb field output,
+# so the size of the mesh is not limited. Save and Load use the npz format,
+# so the results can be reopened without the odb.
+#==============================================================================
+
+import os
+
+import numpy as np
 from Base import Base
+from logWriter import WARNING
 
 class ResultData(Base):
 
     # initialize the attributes
     def __init__(self):
         Base.__init__(self)
-        self.nodePos = {}           # selected fiber nodes
-        self.sumRFo  = [0.,0.,0.]   # sum of reaction forces
-        self.nodeRFo = {}           # reaction force on nodes
-        self.nodeDis = {}           # displacements along the fiber
+        self.labels   = np.zeros(0, dtype=int)  # node labels
+        self.coords   = np.zeros((0,3))         # node coordinates
+        self.disp     = np.zeros((0,3))         # node displacements
+        self.rfo      = np.zeros((0,3))         # reaction force on nodes
+        self.selected = np.zeros(0, dtype=bool) # selected fiber nodes
+        self.sumRFo   = [0.,0.,0.]              # sum of reaction forces
+        self.odbPath  = None                    # odb file of the results, if available
+        self.filename = None                    # npz file with these results, if available
+        self.approximate = False                # expanded from a model with other supports
+
+    # set the nodes, the displacements and reaction forces are reset,
+    # the results do not match a loaded file anymore
+    def setNodes(self, labels, coords):
+        labels = np.asarray(labels, dtype=int).ravel()
+        order  = np.argsort(labels)
+        self.labels   = labels[order]
+        self.coords   = np.asarray(coords, dtype=float).reshape(-1,3)[order]
+        self.disp     = np.zeros((len(labels),3))
+        self.rfo      = np.zeros((len(labels),3))
+        self.selected = np.ones(len(labels), dtype=bool)
+        self.filename = None
+
+    # index of the given labels in the node arrays
+    def getIndex(self, labels):
+        labels = np.asarray(labels, dtype=int).ravel()
+        index  = np.searchsorted(self.labels, labels)
+        if len(labels) > 0 and (np.any(index >= len(self.labels)) or
+                                np.any(self.labels[np.minimum(index, len(self.labels) - 1)] != labels)):
+            raise Exception("error: Unknown node labels in result data")
+        return index
+
+    # set the displacements of the given nodes
+    def setDisplacements(self, labels, values):
+        self.disp[self.getIndex(labels)] = np.asarray(values, dtype=float).reshape(-1,3)
+
+    # set the reaction forces of the given nodes and update their sum
+    def setReactions(self, labels, values):
+        self.rfo[self.getIndex(labels)] = np.asarray(values, dtype=float).reshape(-1,3)
+        self.sumRFo = [float(v) for v in self.rfo.sum(axis=0)]
+
+    # select the nodes for the queries, all nodes if labels is None
+    def select(self, labels = None):
+        self.selected = np.zeros(len(self.labels), dtype=bool)
+        if labels is None: self.selected[:] = True
+        else:              self.selected[self.getIndex(labels)] = True
+
+    # read the nodes and results of an odb frame from the bulk data blocks.
+    # region: odb instance or node set, selection: node set of the queries
+    def readOdbFrame(self, frame, region, selection = None):
+        def bulk(name, subset = region):
+            field  = frame.fieldOutputs[name].getSubset(region=subset)
+            labels = [np.array(block.nodeLabels, dtype=int) for block in field.bulkDataBlocks]
+            values = [np.array(block.data, dtype=float) for block in field.bulkDataBlocks]
+            if len(labels) == 0: return np.zeros(0, dtype=int), np.zeros((0,3))
+            return np.concatenate(labels), np.concatenate(values)
+
+        # the coordinates are only available as field output if requested
+        if 'COORD' in frame.fieldOutputs.keys():
+            labels, coords = bulk('COORD')
+        else:
+            nodes  = region.nodes
+            labels = [node.label for node in nodes]
+            coords = [node.coordinates for node in nodes]
+        self.setNodes(labels, coords)
+
+        labels, values = bulk('U')
+        self.setDisplacements(labels, values[:,:3])
+        if 'RF' in frame.fieldOutputs.keys():
+            labels, values = bulk('RF')
+            self.setReactions(labels, values[:,:3])
+        if selection is not None:
+            self.select(bulk('U', selection)[0])
+
+    # mirror the results on the plane coords[axis] = value, nodes on the plane
+    # are not copied. The copies get labels above the highest label.
+    # Reaction forces normal to the plane on the plane are internal forces of
+    # the full model and are dropped.
+    def mirror(self, axis, value, tol = 1.e-6):
+        onPlane = np.abs(self.coords[:,axis] - value) < tol
+        self.rfo[onPlane, axis] = 0.
+        copy = ~onPlane
+
+        coords = self.coords[copy].copy()
+        disp   = self.disp[copy].copy()
+        rfo    = self.rfo[copy].copy()
+        coords[:,axis] = 2. * value - coords[:,axis]
+        disp[:,axis]   = -disp[:,axis]
+        rfo[:,axis]    = -rfo[:,axis]
+
+        offset   = self.labels.max() if len(self.labels) > 0 else 0
+        labels   = np.concatenate((self.labels, self.labels[copy] + offset))
+        selected = np.concatenate((self.selected, self.selected[copy]))
+        disp     = np.concatenate((self.disp, disp))
+        rfo      = np.concatenate((self.rfo, rfo))
+        self.setNodes(labels, np.concatenate((self.coords, coords)))
+        self.disp     = disp
+        self.rfo      = rfo
+        self.selected = selected
+        self.sumRFo   = [float(v) for v in self.rfo.sum(axis=0)]
+
+    # rebuild the full model from the results of a symmetry reduced model
+    # (data.symmetry: HALF mirrors on x = 0, QUARTER also on z = l/2).
+    # The supports are not symmetric to z = l/2, the expanded QUARTER
+    # results are an approximation of the full model
+    def expandSymmetry(self, data):
+        if data.symmetry == data.FULL: return
+        tol = 1.e-6 * data.l
+        self.mirror(0, 0., tol)
+        if data.symmetry == data.QUARTER:
+            self.mirror(2, data.l / 2., tol)
+            self.approximate = True
+            self.AppendLog("warning: results of '%s' expanded from the quarter model are approximate" % data.name, WARNING)
+
+    # results of a linear analysis scaled by factor
+    def scaled(self, factor):
+        return ResultData.superpose([(factor, self)])
+
+    # linear combination of results on the same mesh: terms = [(factor, result), ...]
+    @staticmethod
+    def superpose(terms):
+        first  = terms[0][1]
+        result = ResultData()
+        result.setNodes(first.labels, first.coords)
+        for factor, term in terms:
+            if len(term.labels) != len(first.labels) or np.any(term.labels != first.labels):
+                raise Exception("error: Results of different meshes can not be superposed")
+            result.disp += factor * term.disp
+            result.rfo  += factor * term.rfo
+        result.selected = first.selected.copy()
+        result.sumRFo   = [float(v) for v in result.rfo.sum(axis=0)]
+        result.odbPath  = first.odbPath
+        result.approximate = any(term.approximate for factor, term in terms)
+        return result
 
     # calculate the maximum vertical displacent along the fiber
-    def getMaxDisp(self):
-        max = 0.
-        for label in self.nodePos:
-            disp = self.nodeDis[label]
-            # y
-            if (fabs(disp[1]) > fabs(max)): max = disp[1]
-        return max
+    def getMaxDisp(self, component = 1):
+        values = self.disp[self.selected, component]
+        if len(values) == 0: return 0.
+        return float(values[np.argmax(np.abs(values))])
+
+    # minimum and maximum of a displacement component of the selected nodes
+    def getExtremes(self, component = 1):
+        values = self.disp[self.selected, component]
+        if len(values) == 0: return 0., 0.
+        return float(values.min()), float(values.max())
+
+    # percentile of a displacement component of the selected nodes
+    def getPercentile(self, q, component = 1, absolute = True):
+        values = self.disp[self.selected, component]
+        if absolute: values = np.abs(values)
+        if len(values) == 0: return 0.
+        return float(np.percentile(values, q))
+
+    # save the results to a npz file
+    def Save(self,filename):
+        f = open(filename,"wb")
+        np.savez(f, labels = self.labels, coords = self.coords, disp = self.disp,
+                 rfo = self.rfo, selected = self.selected, sumRFo = np.array(self.sumRFo),
+                 approximate = np.array(self.approximate))
+        f.close()
+
+    # load the results from a npz file written by Save
+    def Load(self,filename):
+        self.filename = os.path.abspath(filename)
+        content = np.load(filename)
+        try:
+            self.labels   = content["labels"]
+            self.coords   = content["coords"]
+            self.disp     = content["disp"]
+            self.rfo      = content["rfo"]
+            self.selected = content["selected"]
+            self.sumRFo   = [float(v) for v in content["sumRFo"]]
+            self.approximate = "approximate" in content.files and bool(content["approximate"])
+        finally:
+            content.close()
@@ -0,0 +1,153 @@
+#==============================================================================
+# deferred rendering of the deflection plots
+#
+# In headless mode (QuadBeamModel, AbaqusBackend, WorkerBackend) the solver
+# runs do not touch the viewport, only the ResultData arrays are stored in
+# <job>-result.npz. The plots are rendered afterwards from these files, in
+# a process pool and only for the selected runs, e.g. the runs of a sweep
+# with the largest deflections. The sweep records hold the result file of
+# every run and its load factor: superposed cases share the file of their
+# unit load job, cached cases use the file of the cache entry:
+#   renderer = ResultRenderer(processes = 4)
+#   renderer.render(renderer.selectRuns(sweep.records.values(), count = 10))
+#
+#   python resultPlot.py <job>-result.npz ...
+#
+# The plot is a contour of the displacement component over the selected
+# nodes (the top face of the CAE model), in the plane of the length z and
+# the width x, or the deflection line, if the selection is a fiber.
+# matplotlib is only needed here, it is imported by the rendering processes
+# with the Agg backend, so no display is needed.
+#==============================================================================
+
+import os
+import sys
+import time
+from multiprocessing import Pool, cpu_count
+
+import numpy as np
+
+from Base import Base
+from resultData import ResultData
+
+# names of the displacement components
+COMPONENTS = ("U1", "U2", "U3")
+
+# file of the plot of a result file: <job>-result.npz -> <job>-U2.png
+def getPlotName(filename, component = 1):
+    base = filename[:-len("-result.npz")] if filename.endswith("-result.npz") else os.path.splitext(filename)[0]
+    return "%s-%s.png" % (base, COMPONENTS[component])
+
+# contour plot of a displacement component of a result file,
+# the displacements are scaled by factor (superposed load cases)
+def plotResult(filename, output = None, component = 1, dpi = 100, factor = 1.):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    if output is None: output = getPlotName(filename, component)
+    result = ResultData()
+    result.Load(filename)
+    mask = result.selected if result.selected.any() else np.ones(len(result.labels), dtype=bool)
+    x = result.coords[mask,0]
+    z = result.coords[mask,2]
+    u = factor * result.disp[mask,component]
+    if len(u) < 3:
+        raise Exception("error: Not enough nodes to plot '%s'" % filename, len(u))
+
+    figure = plt.figure(figsize = (10., 3.))
+    axes   = figure.add_subplot(111)
+    if np.ptp(x) > 1.e-9 * max(np.ptp(z), 1.):
+        contour = axes.tricontourf(z, x, u, 20, cmap = "viridis")
+        figure.colorbar(contour, ax = axes, label = COMPONENTS[component])
+        axes.set_ylabel("x")
+    else:
+        # a fiber is selected: deflection line along z
+        order = np.argsort(z)
+        axes.plot(z[order], u[order])
+        axes.set_ylabel(COMPONENTS[component])
+    axes.set_xlabel("z")
+    axes.set_title("%s: %s min %.4g, max %.4g" % (os.path.basename(output)[:-4], COMPONENTS[component],
+                                                 u.min(), u.max()))
+    figure.tight_layout()
+    figure.savefig(output, dpi = dpi)
+    plt.close(figure)
+    return output
+
+# render a single run in a pool process, errors are returned
+def _renderFile(args):
+    filename, output, factor, component, dpi = args
+    start = time.time()
+    try:
+        output = plotResult(filename, output, component, dpi, factor)
+        return filename, output, "", time.time() - start
+    except Exception as e:
+        return filename, None, str(e), time.time() - start
+
+class ResultRenderer(Base):
+
+    # processes : number of rendering processes, default: the host cores
+    # component : displacement component of the plots (1: U2)
+    # dpi       : resolution of the images
+    def __init__(self, processes = None, component = 1, dpi = 100):
+        Base.__init__(self)
+        self.processes = cpu_count() if processes is None else processes
+        self.component = component
+        self.dpi       = dpi
+        self.rendered  = {}     # image file -> result file
+        self.failed    = {}     # result file -> error
+
+    # runs of a sweep (state file records) with the largest absolute
+    # deflections, count: None for all runs. Returns a list of
+    # (result file, image file in workdir, load factor)
+    def selectRuns(self, records, count = None, workdir = "."):
+        records = [record for record in records if record.get("status") == "ok"]
+        records.sort(key = lambda record: -abs(record["maxDisp"]))
+        if count is not None: records = records[:count]
+
+        runs = []
+        for record in records:
+            name     = record["params"]["name"]
+            filename = record.get("resultFile")
+            if filename is None or not os.path.exists(filename):
+                self.AppendLog("  no result file for run '%s'" % name)
+                continue
+            output = os.path.join(workdir, "%s-%s.png" % (name, COMPONENTS[self.component]))
+            runs.append((filename, output, record.get("loadFactor", 1.)))
+        return runs
+
+    # render the plots of result files or runs of selectRuns, returns the image files
+    def render(self, runs):
+        tasks = []
+        for run in runs:
+            if not isinstance(run, (list, tuple)): run = (run, None, 1.)
+            tasks.append(tuple(run) + (self.component, self.dpi))
+        if len(tasks) == 0: return []
+        processes = max(1, min(self.processes, len(tasks)))
+        self.AppendLog("render %d plots in %d processes..." % (len(tasks), processes))
+
+        start = time.time()
+        if processes == 1:
+            replies = [_renderFile(task) for task in tasks]
+        else:
+            pool = Pool(processes)
+            try:
+                replies = pool.map(_renderFile, tasks)
+            finally:
+                pool.close()
+                pool.join()
+
+        images = []
+        for filename, output, error, elapsed in replies:
+            if output is None:
+                self.failed[filename] = error
+                self.AppendLog("  %s: failed: %s" % (filename, error))
+                continue
+            self.rendered[output] = filename
+            images.append(output)
+            self.AppendLog("  %s (%.2fs)" % (output, elapsed))
+        self.AppendLog("%d of %d plots rendered in %.2fs" % (len(images), len(tasks), time.time() - start))
+        return images
+
+if __name__ == "__main__":
+    ResultRenderer().render(sys.argv[1:])
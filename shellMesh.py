@@ -0,0 +1,207 @@
+#==============================================================================
+# structured shell mesh of the Quadrilateral Triple-T profile
+#
+# The profile is built from the straight midline segments of the geometry
+# table (geometry.py), every segment is divided by its seed and the cross
+# section is swept along z with lengthSeed elements. Nodes at the junctions
+# of the segments are shared. The mesh is deterministic from InputData, so
+# it can be written as an input deck (inpWriter.py) without the CAE kernel.
+#
+# node label     : k * (number of section points) + point + 1, k = z layer
+# element nodes  : (a,k), (b,k), (b,k+1), (a,k+1) for a segment edge a -> b,
+#                  so the element normal is (b - a) x z
+#
+# symmetry reduced models (InputData.symmetry):
+#   HALF    : x >= 0, the web on x = 0 gets half of its thickness and the
+#             nodes on x = 0 the symmetry conditions XSYMM
+#   QUARTER : additionally z <= l/2 with ZSYMM on z = l/2. The supports are
+#             not symmetric to z = l/2 (fixed at z = 0, fixed y at z = l),
+#             so this is an approximation, not a symmetry reduction: the
+#             midspan plane takes the axial restraint and the support at
+#             z = 0 becomes a "fixed y" support like the one at z = l. The
+#             model is about 1.6% softer than the full one, the expanded
+#             results are marked approximate (ResultData.approximate).
+#==============================================================================
+
+import numpy as np
+
+from Base import Base
+from logWriter import WARNING
+from geometry import QUAD, TSEC, getGeometry
+
+class ShellMesh(Base):
+
+    def __init__(self, data):
+        Base.__init__(self)
+        self.data = data
+        self.tol  = 1.e-6 * max(data.a_q, data.b_q, data.h_t)
+
+        self.points   = []      # section points (x,y)
+        self.keys     = {}      # rounded section point -> index
+        self.segments = []      # (name, point indices, section, thickness factor)
+        self.createSection()
+        self.createMesh()
+
+    # index of a section point, points closer than tol are merged
+    def getPoint(self, x, y):
+        key = (int(round(x / self.tol)), int(round(y / self.tol)))
+        if key not in self.keys:
+            self.keys[key] = len(self.points)
+            self.points.append((x, y))
+        return self.keys[key]
+
+    # index of an existing section point, None if not available
+    def findPoint(self, x, y):
+        return self.keys.get((int(round(x / self.tol)), int(round(y / self.tol))))
+
+    # add a segment from p1 to p2 with n elements,
+    # segments on a symmetry plane get a part of the thickness
+    def addSegment(self, name, p1, p2, n, section, factor = 1.):
+        n = max(int(n), 1)
+        indices = []
+        for i in range(n + 1):
+            t = i / float(n)
+            indices.append(self.getPoint(p1[0] + t * (p2[0] - p1[0]), p1[1] + t * (p2[1] - p1[1])))
+        self.segments.append((name, indices, section, factor))
+
+    # segments and seeds of the geometry table. The reduced models keep the
+    # part x >= 0: segments crossing x = 0 are cut with their seed, segments
+    # on x = 0 get half of the thickness
+    def createSection(self):
+        d = self.data
+        geometry = getGeometry(d)
+        for segment in geometry.segments:
+            name, section, seed, divisor = segment[0], segment[3], segment[4], segment[5]
+            p1, p2 = geometry.getSegmentPoints(segment)
+            n = getattr(d, seed) // divisor
+            if d.symmetry == d.FULL:
+                self.addSegment(name, p1, p2, n, section)
+                continue
+            if max(p1[0], p2[0]) < self.tol and min(p1[0], p2[0]) < -self.tol: continue
+            if max(p1[0], p2[0]) < self.tol:
+                self.addSegment(name, p1, p2, n, section, 0.5)
+            elif min(p1[0], p2[0]) < -self.tol:
+                t   = p1[0] / (p1[0] - p2[0])
+                cut = (0., p1[1] + t * (p2[1] - p1[1]))
+                if p1[0] > 0.: self.addSegment(name, p1, cut, int(n * t), section)
+                else:          self.addSegment(name, cut, p2, int(n * (1. - t)), section)
+            else:
+                self.addSegment(name, p1, p2, n, section)
+
+    # sweep the section along z
+    def createMesh(self):
+        d  = self.data
+        npts = len(self.points)
+        section = np.array(self.points)
+        if d.symmetry == d.QUARTER:
+            self.AppendLog("warning: the quarter model of '%s' approximates the unsymmetric supports" % d.name, WARNING)
+            nz = max(int(d.lengthSeed) // 2, 1)
+            z  = np.linspace(0., d.l / 2., nz + 1)
+        else:
+            nz = max(int(d.lengthSeed), 1)
+            z  = np.linspace(0., d.l, nz + 1)
+
+        self.nLayers = nz + 1
+        self.nPoints = npts
+        self.labels  = np.arange(1, npts * (nz + 1) + 1)
+        self.coords  = np.column_stack((np.tile(section[:,0], nz + 1),
+                                        np.tile(section[:,1], nz + 1),
+                                        np.repeat(z, npts)))
+
+        # element connectivity, section and segment of every element
+        elements = []
+        sections = []
+        segments = []
+        k = np.arange(nz)
+        for s, (name, indices, sec, factor) in enumerate(self.segments):
+            for a, b in zip(indices[:-1], indices[1:]):
+                elements.append(np.column_stack((k * npts + a, k * npts + b,
+                                                 (k + 1) * npts + b, (k + 1) * npts + a)) + 1)
+                sections.append(np.full(nz, sec))
+                segments.append(np.full(nz, s))
+        self.elements = np.concatenate(elements)
+        self.elementSections = np.concatenate(sections)
+        self.elementSegments = np.concatenate(segments)
+        self.elementLabels   = np.arange(1, len(self.elements) + 1)
+
+        self.AppendLog("structured mesh: %d nodes, %d elements" % (len(self.labels), len(self.elements)))
+
+    # node labels of section points at the z layers (all layers if None)
+    def getNodeLabels(self, points, layers = None):
+        if layers is None: layers = range(self.nLayers)
+        points = np.asarray(points, dtype=int)
+        return np.concatenate([k * self.nPoints + points + 1 for k in layers])
+
+    # element labels of a segment
+    def getSegmentElements(self, name):
+        for s, segment in enumerate(self.segments):
+            if segment[0] == name:
+                return self.elementLabels[self.elementSegments == s]
+        raise Exception("error: Unknown segment", name)
+
+    # node labels of a segment
+    def getSegmentNodes(self, name):
+        for segment in self.segments:
+            if segment[0] == name:
+                return self.getNodeLabels(segment[1])
+        raise Exception("error: Unknown segment", name)
+
+    # named node sets, as in abaqusQuadBeam.py
+    def getNodeSets(self):
+        d  = self.data
+        geometry   = getGeometry(d)
+        flangeEnds = [self.findPoint(x, y) for x, y, z in geometry.vertices["bcFixedAll"]]
+        webBottoms = [self.findPoint(x, y) for x, y, z in geometry.vertices["bcFixedXZ"][len(flangeEnds):]]
+        flangeEnds = [p for p in flangeEnds if p is not None]
+        webBottoms = [p for p in webBottoms if p is not None]
+        last       = self.nLayers - 1
+
+        sets = {"S"          : self.getSegmentNodes("top"),
+                "bcFixedAll" : self.getNodeLabels(flangeEnds, [0]),
+                "bcFixedY"   : self.getNodeLabels(flangeEnds, [last]),
+                "bcFixedXZ"  : self.getNodeLabels(flangeEnds + webBottoms, [0])}
+
+        # symmetry planes
+        if d.symmetry != d.FULL:
+            onPlane = [i for i, (x, y) in enumerate(self.points) if abs(x) < self.tol]
+            sets["XSYMM"] = self.getNodeLabels(onPlane)
+        if d.symmetry == d.QUARTER:
+            sets["bcFixedAll"] = np.zeros(0, dtype=int)
+            sets["bcFixedY"]   = self.getNodeLabels(flangeEnds, [0])
+            sets["ZSYMM"]      = self.getNodeLabels(range(self.nPoints), [last])
+
+        # fiber on the top face at x = 0, only available for an even width seed
+        fiber = self.findPoint(*geometry.getFiber()[:2])
+        if fiber is not None: sets["WEB"] = self.getNodeLabels([fiber])
+        return sets
+
+    # shell thickness of a section.
+    # abaqusQuadBeam.py assigns the quad section to the T faces as well, the
+    # deck and the local solver follow it, so all paths solve the same model
+    def getThickness(self, section):
+        return self.data.s_q
+
+    # thickness of the elements of a segment
+    def getSegmentThickness(self, segment):
+        return self.getThickness(segment[2]) * segment[3]
+
+    # named element sets
+    def getElementSets(self):
+        return {"QuadSet" : self.elementLabels[self.elementSections == QUAD],
+                "TSet"    : self.elementLabels[self.elementSections == TSEC],
+                "TOP"     : self.getSegmentElements("top")}
+
+    # element sets of the shell sections: list of (name, labels, thickness).
+    # QuadSection and TSection, segments on a symmetry plane get their own
+    # set, so every element is in exactly one section set
+    def getSectionSets(self):
+        sets = []
+        for name, section in (("QuadSection", QUAD), ("TSection", TSEC)):
+            thickness = {}
+            for s, segment in enumerate(self.segments):
+                if segment[2] != section: continue
+                thickness.setdefault(self.getSegmentThickness(segment), []).append(s)
+            for i, t in enumerate(sorted(thickness.keys(), reverse=True)):
+                labels = self.elementLabels[np.isin(self.elementSegments, thickness[t])]
+                sets.append((name if i == 0 else "%s-%d" % (name, i), labels, t))
+        return sets
@@ -0,0 +1,192 @@
+#==============================================================================
+# local linear static solver for the Quadrilateral Triple-T model
+#
+# Solves the model of abaqusQuadBeam.py on the structured mesh of ShellMesh
+# with SciPy sparse matrices, without Abaqus. The elements are flat
+# rectangular shells with 6 dofs per node:
+#   membrane : bilinear with incompatible modes (no locking in web bending)
+#   bending  : Mindlin plate, transverse shear interpolated as in MITC4
+#   drilling : small penalty stiffness
+# Supports and load are those of abaqusQuadBeam.py: "fixed all" at z = 0,
+# "fixed y" (u1, u2, ur2, ur3) at z = l and the pressure p1 on the top face.
+# Symmetry reduced models are solved reduced and mirrored to the full model.
+#==============================================================================
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import spsolve
+
+from Base import Base
+from resultData import ResultData
+from shellMesh import ShellMesh
+
+# gauss points of the 2x2 rule
+GAUSS = (-1. / np.sqrt(3.), 1. / np.sqrt(3.))
+
+# natural coordinates of the element nodes
+XI  = np.array([-1., 1., 1., -1.])
+ETA = np.array([-1., -1., 1., 1.])
+
+# shape functions and their derivatives with respect to x and y
+# of a rectangle with edge lengths a and b
+def shape(xi, eta, a, b):
+    N    = 0.25 * (1. + XI * xi) * (1. + ETA * eta)
+    dNdx = 0.25 * XI * (1. + ETA * eta) * 2. / a
+    dNdy = 0.25 * ETA * (1. + XI * xi) * 2. / b
+    return N, dNdx, dNdy
+
+# local stiffness (24x24) of a rectangular shell element a x b
+# dofs per node: u, v, w, rx, ry, rz
+def elementStiffness(a, b, t, E, nu, drilling = 1.e-4):
+    Dm = E * t / (1. - nu**2) * np.array([[1., nu, 0.], [nu, 1., 0.], [0., 0., (1. - nu) / 2.]])
+    Db = Dm * t**2 / 12.
+    Ds = 5. / 6. * E / (2. * (1. + nu)) * t * np.eye(2)
+    detJ = a * b / 4.
+
+    # membrane with incompatible modes, condensed
+    Kuu = np.zeros((8, 8))
+    Kua = np.zeros((8, 4))
+    Kaa = np.zeros((4, 4))
+    for xi in GAUSS:
+        for eta in GAUSS:
+            N, dNdx, dNdy = shape(xi, eta, a, b)
+            B = np.zeros((3, 8))
+            B[0, 0::2] = dNdx
+            B[1, 1::2] = dNdy
+            B[2, 0::2] = dNdy
+            B[2, 1::2] = dNdx
+            # modes (1 - xi^2) and (1 - eta^2) for u and v
+            Ba = np.zeros((3, 4))
+            Ba[0, 0] = -4. * xi / a
+            Ba[2, 1] = -4. * eta / b
+            Ba[2, 2] = -4. * xi / a
+            Ba[1, 3] = -4. * eta / b
+            Kuu += B.T.dot(Dm).dot(B) * detJ
+            Kua += B.T.dot(Dm).dot(Ba) * detJ
+            Kaa += Ba.T.dot(Dm).dot(Ba) * detJ
+    Km = Kuu - Kua.dot(np.linalg.solve(Kaa, Kua.T))
+
+    # plate dofs per node: w, rx, ry
+    # curvatures: kx = d(ry)/dx, ky = -d(rx)/dy, kxy = d(ry)/dy - d(rx)/dx
+    # shear:      gxz = dw/dx + ry, gyz = dw/dy - rx
+    def shearRows(xi, eta):
+        N, dNdx, dNdy = shape(xi, eta, a, b)
+        B = np.zeros((2, 12))
+        B[0, 0::3] = dNdx
+        B[0, 2::3] = N
+        B[1, 0::3] = dNdy
+        B[1, 1::3] = -N
+        return B
+
+    # MITC4 tying points: gxz at eta = -1, +1 and gyz at xi = -1, +1
+    gxzA, gxzC = shearRows(0., -1.)[0], shearRows(0., 1.)[0]
+    gyzD, gyzB = shearRows(-1., 0.)[1], shearRows(1., 0.)[1]
+
+    Kp = np.zeros((12, 12))
+    for xi in GAUSS:
+        for eta in GAUSS:
+            N, dNdx, dNdy = shape(xi, eta, a, b)
+            Bb = np.zeros((3, 12))
+            Bb[0, 2::3] = dNdx
+            Bb[1, 1::3] = -dNdy
+            Bb[2, 2::3] = dNdy
+            Bb[2, 1::3] = -dNdx
+            Bs = np.array([0.5 * (1. - eta) * gxzA + 0.5 * (1. + eta) * gxzC,
+                           0.5 * (1. - xi) * gyzD + 0.5 * (1. + xi) * gyzB])
+            Kp += (Bb.T.dot(Db).dot(Bb) + Bs.T.dot(Ds).dot(Bs)) * detJ
+
+    K = np.zeros((24, 24))
+    membrane = np.array([[6 * i, 6 * i + 1] for i in range(4)]).ravel()
+    plate    = np.array([[6 * i + 2, 6 * i + 3, 6 * i + 4] for i in range(4)]).ravel()
+    K[np.ix_(membrane, membrane)] = Km
+    K[np.ix_(plate, plate)]       = Kp
+
+    # drilling stiffness, small compared to the bending stiffness
+    kz = drilling * np.max(np.diag(Kp)[1::3])
+    for i in range(4): K[6 * i + 5, 6 * i + 5] = kz
+    return K
+
+class ShellSolver(Base):
+
+    # drilling: penalty factor of the drilling stiffness
+    def __init__(self, data, mesh = None, drilling = 1.e-4):
+        Base.__init__(self)
+        self.data     = data
+        self.mesh     = ShellMesh(data) if mesh is None else mesh
+        self.drilling = drilling
+
+    # assemble the global stiffness matrix and the load vector
+    def assemble(self):
+        d    = self.data
+        mesh = self.mesh
+        ndof = 6 * len(mesh.labels)
+        rows, cols, vals = [], [], []
+        f = np.zeros(ndof)
+
+        # all elements of a segment have the same size and orientation
+        for s, segment in enumerate(mesh.segments):
+            name = segment[0]
+            elements = mesh.elements[mesh.elementSegments == s] - 1
+            if len(elements) == 0: continue
+            x0 = mesh.coords[elements[0]]
+            e1 = x0[1] - x0[0]
+            e2 = x0[3] - x0[0]
+            a, b = np.linalg.norm(e1), np.linalg.norm(e2)
+            e1, e2 = e1 / a, e2 / b
+            R = np.array([e1, e2, np.cross(e1, e2)])
+
+            T = np.zeros((24, 24))
+            for i in range(8): T[3 * i:3 * i + 3, 3 * i:3 * i + 3] = R
+            Ke = elementStiffness(a, b, mesh.getSegmentThickness(segment), d.EMod, d.nue, self.drilling)
+            Ke = T.T.dot(Ke).dot(T)
+
+            dofs = (6 * elements[:, :, None] + np.arange(6)).reshape(-1, 24)
+            rows.append(np.repeat(dofs, 24, axis=1).ravel())
+            cols.append(np.tile(dofs, (1, 24)).ravel())
+            vals.append(np.tile(Ke.ravel(), len(elements)))
+
+            # pressure on the top face: a positive magnitude -p1 acts against the normal
+            if name == "top":
+                force = d.p1 * a * b / 4. * R[2]
+                for j in range(3):
+                    np.add.at(f, 6 * elements.ravel() + j, force[j])
+
+        K = coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                       shape=(ndof, ndof)).tocsr()
+        return K, f
+
+    # constrained dofs of the supports and the symmetry planes
+    def getConstraints(self):
+        sets  = self.mesh.getNodeSets()
+        dofs  = {"bcFixedAll" : [0, 1, 2, 3, 4, 5],
+                 "bcFixedY"   : [0, 1, 4, 5],
+                 "XSYMM"      : [0, 4, 5],      # u1, ur2, ur3
+                 "ZSYMM"      : [2, 3, 4]}      # u3, ur1, ur2
+        fixed = [6 * (sets[name][:, None] - 1) + np.array(dofs[name]) for name in dofs if name in sets]
+        return np.unique(np.concatenate([f.ravel() for f in fixed]))
+
+    # solve the linear static problem, returns a ResultData object
+    def solve(self):
+        mesh = self.mesh
+        self.AppendLog("local solver: %d nodes, %d elements..." % (len(mesh.labels), len(mesh.elements)))
+        K, f = self.assemble()
+
+        fixed = self.getConstraints()
+        free  = np.setdiff1d(np.arange(K.shape[0]), fixed)
+        u = np.zeros(K.shape[0])
+        u[free] = spsolve(K[free][:, free].tocsc(), f[free])
+
+        # reaction forces on the supports
+        rf = np.zeros(K.shape[0])
+        rf[fixed] = K[fixed].dot(u) - f[fixed]
+
+        u  = u.reshape(-1, 6)
+        rf = rf.reshape(-1, 6)
+        result = ResultData()
+        result.setNodes(mesh.labels, mesh.coords)
+        result.setDisplacements(mesh.labels, u[:, :3])
+        result.setReactions(mesh.labels, rf[:, :3])
+        result.select(mesh.getNodeSets()["S"])
+        result.expandSymmetry(self.data)
+        self.AppendLog("Maximum Deflection is '%s'..." % result.getExtremes()[0])
+        return result
@@ -0,0 +1,101 @@
+#==============================================================================
+# auto-tuning of the solver parallelism and memory
+#
+# The size of a model is estimated from its seeds without meshing it: the
+# cross section has one node per element (a closed tube with the T trees
+# attached), the section is swept along z with lengthSeed elements and every
+# shell node has 6 dofs. The tuner chooses for every job
+#   numCpus    : one core per elementsPerCore elements, at most the cores
+#                of the host shared by the concurrent jobs, or the cores
+#                assigned by the runner
+#   numDomains : numCpus, given domains limit numCpus to a divisor
+#   memory     : the share of the concurrent jobs of maxMemory percent,
+#                at least the estimated memory of the solver
+#   mpMode     : threads for a job on more than one core
+# so a single large run gets the whole host, many small runs get one core
+# each and run side by side. Values set in InputData (not 0) are kept.
+#
+# usage:
+#   settings = SolverTuner(concurrentJobs = 4).tune(data, cpus = 2)
+#   -> {"numCpus": 2, "numDomains": 2, "memory": 22.5, "mpMode": 1}
+#==============================================================================
+
+import os
+from multiprocessing import cpu_count
+
+from Base import Base
+from logWriter import DEBUG
+from geometry import getGeometry
+
+# physical memory of the host in MB, None if not available
+def physicalMemory():
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024.**2
+    except (AttributeError, ValueError, OSError):
+        return None
+
+class SolverTuner(Base):
+
+    # rough memory of the direct solver: base of the process and MB per dof
+    BASEMEMORY = 256.
+    DOFMEMORY  = 0.004
+
+    # cores          : cores of the host, default: all
+    # concurrentJobs : number of jobs sharing the host
+    # elementsPerCore: elements below which a further core does not pay off
+    # maxMemory      : memory of all jobs in % of the physical memory
+    # hostMemory     : physical memory in MB, default: read from the system
+    def __init__(self, cores = None, concurrentJobs = 1, elementsPerCore = 5000,
+                 maxMemory = 90., hostMemory = None):
+        Base.__init__(self)
+        self.cores           = cpu_count() if cores is None else cores
+        self.concurrentJobs  = max(1, concurrentJobs)
+        self.elementsPerCore = elementsPerCore
+        self.maxMemory       = maxMemory
+        self.hostMemory      = physicalMemory() if hostMemory is None else hostMemory
+
+    # estimated size of the model: elements, nodes, dofs
+    def estimate(self, data):
+        section = 0
+        for segment in getGeometry(data).segments:
+            section += max(int(getattr(data, segment[4])) // segment[5], 1)
+        nz = max(int(data.lengthSeed), 1)
+        if data.symmetry != data.FULL: section = (section + 1) // 2
+        if data.symmetry == data.QUARTER: nz = max(nz // 2, 1)
+        nodes = section * (nz + 1)
+        return {"elements": section * nz, "nodes": nodes, "dofs": 6 * nodes}
+
+    # cores of a job, cpus: cores assigned by the runner, None: the share of the host.
+    # The domains must be a multiple of the cores, with given domains the
+    # cores are the largest divisor of them
+    def getCpus(self, data, cpus = None):
+        if data.numCpus > 0: return data.numCpus
+        available = max(1, self.cores // self.concurrentJobs) if cpus is None else max(1, cpus)
+        wanted    = -(-self.estimate(data)["elements"] // self.elementsPerCore)
+        numCpus   = max(1, min(available, wanted))
+        if data.numDomains > 0:
+            while data.numDomains % numCpus != 0: numCpus -= 1
+        return numCpus
+
+    # memory of a job in % of the physical memory
+    def getMemory(self, data):
+        if data.memory > 0.: return data.memory
+        share = self.maxMemory / self.concurrentJobs
+        if self.hostMemory is None: return share
+        needed = 100. * (SolverTuner.BASEMEMORY + SolverTuner.DOFMEMORY * self.estimate(data)["dofs"]) / self.hostMemory
+        if needed > share:
+            self.AppendLog("  %s: estimated memory %.1f%% exceeds the share %.1f%% of %d jobs"
+                           % (data.jobname, needed, share, self.concurrentJobs))
+        return min(max(share, needed), self.maxMemory)
+
+    # solver settings of a job: numCpus, numDomains, memory, mpMode
+    def tune(self, data, cpus = None):
+        numCpus  = self.getCpus(data, cpus)
+        settings = {"numCpus"    : numCpus,
+                    "numDomains" : data.numDomains if data.numDomains > 0 else numCpus,
+                    "memory"     : self.getMemory(data),
+                    "mpMode"     : data.mpMode if data.mpMode != data.DEFAULT or numCpus == 1 else data.THREADS}
+        self.AppendLog("  %s: %d elements, %d cpus, %d domains, %.1f%% memory, mode %d"
+                       % (data.jobname, self.estimate(data)["elements"], settings["numCpus"],
+                          settings["numDomains"], settings["memory"], settings["mpMode"]), DEBUG)
+        return settings
@@ -0,0 +1,89 @@
+#==============================================================================
+# wall time, cpu time and peak memory of named stages
+#
+# usage:
+#   timer = StageTimer()
+#   with timer.stage("mesh") as record:
+#       ...
+#       record["nodes"] = len(nodes)
+#   timer.Save("CP1-Linear-timing.json")
+#
+# The peak memory is the peak resident size of the process in MB, read from
+# the resource module (Unix) or psutil, if one of them is available. It
+# never decreases, so the increase of a stage shows where the memory goes.
+#==============================================================================
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from Base import Base
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# peak resident size of the process in MB, None if not available
+def peakMemory():
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS, kilobytes on linux
+        return peak / 1024.**2 if os.uname()[0] == "Darwin" else peak / 1024.
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 1024.**2
+    except ImportError:
+        return None
+
+# cpu time of the process, user and system
+def cpuTime():
+    times = os.times()
+    return times[0] + times[1]
+
+class StageTimer(Base):
+
+    def __init__(self):
+        Base.__init__(self)
+        self.records = []       # one dict per stage in the order of execution
+        self.counts  = {}       # counts of the model, e.g. nodes and elements
+
+    # measure a stage, the yielded record takes additional values
+    @contextmanager
+    def stage(self, name):
+        record = {"stage": name}
+        memory = peakMemory()
+        cpu    = cpuTime()
+        start  = time.time()
+        try:
+            yield record
+        finally:
+            record["wall"] = time.time() - start
+            record["cpu"]  = cpuTime() - cpu
+            record["peakMemory"] = peakMemory()
+            if memory is not None:
+                record["memoryIncrease"] = record["peakMemory"] - memory
+            self.records.append(record)
+            self.AppendLog("  stage %-12s %8.3f s wall %8.3f s cpu" % (name, record["wall"], record["cpu"]))
+
+    # record of a stage, None if not measured
+    def getRecord(self, name):
+        for record in self.records:
+            if record["stage"] == name: return record
+        return None
+
+    # report of all stages
+    def getReport(self):
+        return {"stages" : self.records,
+                "counts" : self.counts,
+                "wall"   : sum(record["wall"] for record in self.records),
+                "cpu"    : sum(record["cpu"] for record in self.records),
+                "peakMemory" : peakMemory()}
+
+    # save the report as json
+    def Save(self, filename):
+        f = open(filename, "w")
+        json.dump(self.getReport(), f, indent = 2, sort_keys = True)
+        f.close()
@@ -0,0 +1,23 @@
+# the modules of the repository are imported from the parent directory
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Base import Base
+
+# the session and every test run in their own directories,
+# the logs and results are written there
+@pytest.fixture(scope="session", autouse=True)
+def sessiondir(tmpdir_factory):
+    with tmpdir_factory.mktemp("session").as_cwd():
+        yield
+        Base.GetLogWriter().flush()
+
+@pytest.fixture(autouse=True)
+def workdir(tmpdir):
+    with tmpdir.as_cwd():
+        yield tmpdir
+        Base.GetLogWriter().flush()
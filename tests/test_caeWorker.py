@@ -0,0 +1,26 @@
+import os
+
+import fakeAbaqus
+fakeAbaqus.install()
+
+import inputData
+from caeWorker import AbaqusHandler, CaeWorker
+
+def test_run_release():
+    worker = CaeWorker(AbaqusHandler())
+    for load in (-10., -20., -30.):
+        params = inputData.InputData(name = "W%d" % -load, load = load).getParameters()
+        fakeAbaqus.register(inputData.InputData(**params), "TWA-Worker")
+        reply  = worker.execute({"command": "run", "params": params, "cpus": 1, "headless": True})
+        assert reply["status"] == "ok", reply
+        assert os.path.exists(reply["result"])
+
+        # the job and the odb of the run are released
+        assert len(fakeAbaqus.mdb.jobs) == 0
+        assert len(fakeAbaqus.session.odbs) == 0
+
+def test_reload():
+    worker = CaeWorker(AbaqusHandler())
+    assert worker.execute({"command": "reload"})["status"] == "ok"
+    data = worker.getData({"params": {"name": "R1", "load": -5.}})
+    assert type(data) is inputData.InputData
@@ -0,0 +1,20 @@
+import geometry
+from geometry import getGeometry
+from inputData import InputData
+
+def test_memo_bounded(monkeypatch):
+    monkeypatch.setattr(geometry, "CACHESIZE", 3)
+    monkeypatch.setattr(geometry, "_CACHE", geometry.OrderedDict())
+
+    first = getGeometry(InputData(l = 1000.))
+    assert getGeometry(InputData(l = 1000., load = -10.)) is first
+    second = getGeometry(InputData(l = 2000.))
+
+    # the first geometry is used again, the second one is evicted
+    getGeometry(InputData(l = 1000.))
+    getGeometry(InputData(l = 3000.))
+    getGeometry(InputData(l = 4000.))
+    assert len(geometry._CACHE) == 3
+    assert getGeometry(InputData(l = 1000.)) is first
+    assert getGeometry(InputData(l = 2000.)) is not second
+    assert len(geometry._CACHE) == 3
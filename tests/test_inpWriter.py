@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from inputData import InputData
+from inpWriter import InpWriter
+from shellMesh import ShellMesh
+
+# elsets and shell sections of a deck: {name: labels}, [(elset, thickness)],
+# element labels, element nodes, node labels and nsets
+def readDeck(filename):
+    elsets, sections, elements = {}, [], []
+    connectivity, nodes, nsets = [], [], {}
+    keyword, current = None, None
+    for line in open(filename):
+        line = line.strip()
+        if line.startswith("*"):
+            keyword = line.split(",")[0].lower()
+            options = dict(item.strip().split("=") for item in line.split(",")[1:] if "=" in item)
+            if keyword == "*elset":
+                current = elsets.setdefault(options["elset"], [])
+            elif keyword == "*nset":
+                current = nsets.setdefault(options["nset"], [])
+            elif keyword == "*shell section":
+                sections.append([options["elset"], None])
+            continue
+        values = [value for value in line.split(",") if value.strip()]
+        if keyword in ("*elset", "*nset"):
+            current.extend(int(value) for value in values)
+        elif keyword == "*node":
+            nodes.append(int(values[0]))
+        elif keyword == "*shell section" and sections[-1][1] is None:
+            sections[-1][1] = float(values[0])
+        elif keyword == "*element":
+            elements.append(int(values[0]))
+            connectivity.append([int(value) for value in values[1:]])
+    return elsets, sections, elements, connectivity, nodes, nsets
+
+@pytest.mark.parametrize("symmetry", [0, 1, 2])
+def test_sections(symmetry):
+    data = InputData(symmetry = symmetry)
+    mesh = ShellMesh(data)
+    filename = InpWriter(data, mesh).write("deck.inp")
+    elsets, sections, elements, connectivity, nodes, nsets = readDeck(filename)
+
+    # the deck holds the mesh and the sets of ShellMesh
+    assert np.array_equal(nodes, mesh.labels)
+    assert np.array_equal(elements, mesh.elementLabels)
+    assert np.array_equal(connectivity, mesh.elements)
+    for name, labels in mesh.getElementSets().items():
+        assert np.array_equal(elsets[name], labels)
+    for name, labels in mesh.getNodeSets().items():
+        if name in nsets: assert np.array_equal(nsets[name], labels)
+    assert set(("S", "bcFixedY", "bcFixedXZ")) <= set(nsets.keys())
+
+    # every element has exactly one section
+    assigned = np.concatenate([elsets[name] for name, thickness in sections])
+    assert np.array_equal(np.sort(assigned), np.sort(elements))
+    assert len(assigned) == len(np.unique(assigned))
+
+    # the grouping sets are there, but have no section
+    assert set(("QuadSet", "TSet", "TOP")) <= set(elsets.keys())
+    assert not set(("QuadSet", "TSet")) & set(name for name, thickness in sections)
+
+    # the segments on the symmetry plane x = 0 have half the thickness
+    thickness = dict(sections)
+    assert thickness["QuadSection"] == pytest.approx(mesh.getThickness(0))
+    assert thickness["TSection"] == pytest.approx(mesh.getThickness(1))
+    if symmetry != data.FULL:
+        assert thickness["TSection-1"] == pytest.approx(mesh.getThickness(1) / 2.)
+        assert len(elsets["TSection"]) + len(elsets["TSection-1"]) == len(elsets["TSet"])
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from inputData import InputData
+from loadCases import LoadCaseEngine
+from parameterSweep import LocalBackend
+from shellSolver import ShellSolver
+
+# counts the solver runs
+class CountingBackend(LocalBackend):
+
+    def __init__(self):
+        self.runs = 0
+
+    def solve(self, data, cpus = 1):
+        self.runs += 1
+        return LocalBackend.solve(self, data, cpus)
+
+def test_combination():
+    backend = CountingBackend()
+    engine  = LoadCaseEngine(backend, InputData())
+    engine.addLoadCase("dead", -10.)
+    engine.addLoadCase("live", -19.)
+    engine.addCombination("ULS", {"dead": 1.35, "live": 1.5})
+    assert engine.getLoad("ULS") == pytest.approx(-42.)
+
+    combined = engine.getResult("ULS")
+    direct   = ShellSolver(InputData(load = -42.)).solve()
+    # equal up to the round off of the solver
+    scale = np.abs(direct.disp).max()
+    assert np.allclose(combined.disp, direct.disp, rtol = 0., atol = 1.e-9 * scale)
+    assert combined.getMaxDisp() == pytest.approx(direct.getMaxDisp(), rel = 1.e-9)
+    assert np.allclose(combined.sumRFo, direct.sumRFo, rtol = 0., atol = 1.e-9 * np.abs(direct.sumRFo).max())
+
+    # every case is taken from the unit load
+    report = engine.getReport()
+    assert sorted(report) == ["ULS", "dead", "live"]
+    assert backend.runs == 1
+
+def test_unknown_case():
+    engine = LoadCaseEngine(CountingBackend(), InputData())
+    engine.addLoadCase("dead", -10.)
+    with pytest.raises(Exception):
+        engine.addCombination("ULS", {"dead": 1.35, "snow": 1.5})
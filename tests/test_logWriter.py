@@ -0,0 +1,73 @@
+import json
+import os
+from multiprocessing import Process, Queue
+
+import logWriter
+from logWriter import DEBUG, ERROR, INFO, WARNING, LogListener, LogWriter, QueueLogWriter
+
+def readLines(filename):
+    if not os.path.exists(filename): return []
+    return open(filename).read().splitlines()
+
+def test_buffering():
+    writer = LogWriter("test.log", level = INFO, bufferSize = 3, flushInterval = 1.e6, echo = False)
+    writer.write("first")
+    writer.write("second")
+    assert readLines("test.log") == []
+    writer.write("third")
+    assert [line.split("|")[1] for line in readLines("test.log")] == ["first", "second", "third"]
+
+    # errors are written at once
+    writer.write("fourth")
+    writer.write("failed", ERROR)
+    assert len(readLines("test.log")) == 5
+    writer.close()
+
+def test_level():
+    writer = LogWriter("test.log", level = WARNING, echo = False)
+    writer.write("debug", DEBUG)
+    writer.write("info", INFO)
+    writer.write("warning", WARNING)
+    writer.write("error", ERROR)
+    writer.close()
+    assert [line.split("|")[1] for line in readLines("test.log")] == ["warning", "error"]
+
+def test_json():
+    writer = LogWriter("test.log", level = DEBUG, format = "json", echo = False)
+    writer.write("trace", DEBUG)
+    writer.write("done")
+    writer.close()
+    records = [json.loads(line) for line in readLines("test.log")]
+    assert [(r["level"], r["text"], r["pid"]) for r in records] == [("DEBUG", "trace", os.getpid()),
+                                                                    ("INFO", "done", os.getpid())]
+    assert all(isinstance(r["time"], float) for r in records)
+
+def test_close_unregisters():
+    writer = LogWriter("test.log", echo = False)
+    assert writer in logWriter._writers
+    writer.write("pending")
+    writer.close()
+    assert writer not in logWriter._writers
+    assert len(readLines("test.log")) == 1
+
+# worker process which logs through the queue
+def _work(queue, count):
+    writer = QueueLogWriter(queue, INFO)
+    writer.write("hidden", DEBUG)
+    for i in range(count): writer.write("message %d" % i)
+
+def test_queue_processes():
+    queue    = Queue()
+    writer   = LogWriter("test.log", level = INFO, format = "json", echo = False)
+    listener = LogListener(queue, writer)
+    listener.start()
+    workers = [Process(target = _work, args = (queue, 5)) for i in range(3)]
+    for worker in workers: worker.start()
+    for worker in workers: worker.join()
+    listener.stop()
+    writer.close()
+
+    records = [json.loads(line) for line in readLines("test.log")]
+    assert len(records) == 15
+    assert set(r["pid"] for r in records) == set(worker.pid for worker in workers)
+    assert all(r["text"].startswith("message") for r in records)
@@ -0,0 +1,28 @@
+import pytest
+
+from inputData import InputData
+from meshConvergence import ConvergenceStudy
+from parameterSweep import LocalBackend
+
+def test_extrapolate_uneven_ratios():
+    study = ConvergenceStudy(LocalBackend(), InputData())
+    # f = 10 - 3 h^1.5 with h = 1 / sqrt(elements) and uneven refinement ratios
+    for elements in (100, 260, 900):
+        study.levels.append({"elements": elements, "maxDisp": 10. - 3. * (1. / elements**0.5)**1.5})
+    estimate, order = study.extrapolate()
+    assert order == pytest.approx(1.5, rel = 1.e-6)
+    assert estimate == pytest.approx(10., rel = 1.e-9)
+
+def test_even_seeds():
+    study = ConvergenceStudy(LocalBackend(), InputData(lengthSeed = 5, quadWidthSeed = 5), ratio = 1.5)
+    for level in range(4):
+        seeds = study.getSeeds(level)
+        assert seeds["lengthSeed"] % 2 == 0
+        assert seeds["quadWidthSeed"] % 2 == 0
+
+def test_three_levels():
+    study = ConvergenceStudy(LocalBackend(), InputData(), tolerance = 0.05, ratio = 1.5, maxLevels = 4)
+    seeds = study.run()
+    assert len(study.levels) >= 3
+    assert study.estimate is not None
+    assert ConvergenceStudy.lookup("CP1") == seeds
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from inputData import InputData
+from geometry import getGeometry
+from nodeIndex import NodeIndex
+from shellMesh import ShellMesh
+
+def bruteBox(coords, labels, lower, upper, tol = 0.):
+    lower = np.asarray(lower, dtype=float) - tol
+    upper = np.asarray(upper, dtype=float) + tol
+    return np.sort(labels[np.all((coords >= lower) & (coords <= upper), axis=1)])
+
+@pytest.fixture(params=[{}, {"lengthSeed": 40, "quadWidthSeed": 20}])
+def mesh(request):
+    data = InputData(**request.param)
+    mesh = ShellMesh(data)
+    return data, mesh, NodeIndex(mesh.labels, mesh.coords)
+
+def test_box(mesh):
+    data, mesh, index = mesh
+    lower, upper = getGeometry(data).getTopBox()
+    labels = index.inBox(lower, upper, 1.e-6)
+    expected = bruteBox(mesh.coords, mesh.labels, lower, upper, 1.e-6)
+    assert len(labels) == len(np.unique(labels))
+    assert np.array_equal(np.sort(labels), expected)
+    assert len(labels) == (data.quadWidthSeed + 1) * (data.lengthSeed + 1)
+
+def test_line(mesh):
+    data, mesh, index = mesh
+    point  = getGeometry(data).getFiber()
+    labels = index.onLine(point, 2, 1.e-6)
+    lower, upper = np.array(point), np.array(point)
+    lower[2], upper[2] = -np.inf, np.inf
+    expected = bruteBox(mesh.coords, mesh.labels, lower, upper, 1.e-6)
+    assert np.array_equal(np.sort(labels), expected)
+    assert len(labels) == data.lengthSeed + 1
+
+def test_plane(mesh):
+    data, mesh, index = mesh
+    for axis, value in ((0, 0.), (1, data.quad_y), (2, 0.), (2, data.l)):
+        labels = index.onPlane(axis, value, 1.e-6)
+        mask   = np.abs(mesh.coords[:,axis] - value) <= 1.e-6
+        assert len(labels) == len(np.unique(labels))
+        assert np.array_equal(np.sort(labels), np.sort(mesh.labels[mask]))
+
+def test_nearest(mesh):
+    data, mesh, index = mesh
+    points = np.random.RandomState(0).uniform(mesh.coords.min(axis=0), mesh.coords.max(axis=0), (50,3))
+    labels, dists = index.nearest(points)
+    for point, label, dist in zip(points, labels, dists):
+        d = np.sqrt(((mesh.coords - point)**2).sum(axis=1))
+        assert dist == pytest.approx(d.min())
@@ -0,0 +1,87 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import parameterSweep
+from inputData import InputData
+from parameterSweep import FakeBackend, ParameterSweep, licenseTokens
+from resultData import ResultData
+
+# fails the first attempt of every job, the marker files are shared by the pool processes
+class FlakyBackend(FakeBackend):
+    name = "flaky"
+
+    def solve(self, data, cpus = 1):
+        marker = os.path.abspath(data.jobname + ".failed")
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            raise Exception("error: first attempt of '%s' failed" % data.jobname)
+        return FakeBackend.solve(self, data, cpus)
+
+def readState(filename):
+    return [json.loads(line) for line in open(filename) if line.strip()]
+
+def test_retry():
+    sweep = ParameterSweep(FlakyBackend(delay = 0.), retries = 1)
+    sweep.addCases(load = [-10., -20.])
+    report = sweep.run()
+    assert report["done"] == 2
+    assert all(record["attempts"] == 2 for record in sweep.records.values())
+
+def test_failed_after_retries():
+    sweep = ParameterSweep(FakeBackend(delay = 0., failRate = 1.), retries = 2)
+    sweep.addCases(load = [-10., -20.])
+    report = sweep.run()
+    assert report["failed"] == 2 and report["done"] == 0
+    for record in readState("sweep.state"):
+        assert record["status"] == "failed" and record["attempts"] == 3
+        assert "fake solver failure" in record["error"]
+
+def test_resume():
+    sweep = ParameterSweep(FakeBackend(delay = 0.))
+    sweep.addCases(load = [-10., -20.])
+    sweep.run()
+    assert len(readState("sweep.state")) == 2
+
+    # a second sweep on the same state file only runs the new case
+    again = ParameterSweep(FakeBackend(delay = 0.))
+    again.addCases(load = [-10., -20., -30.])
+    report = again.run()
+    assert again.finished == 1 and report["done"] == 3
+    assert len(readState("sweep.state")) == 3
+
+    # failed cases are run again
+    open("sweep.state", "a").write(json.dumps(dict(readState("sweep.state")[0], status = "failed")) + "\n")
+    again.run()
+    assert again.finished == 1
+
+def test_token_slots(monkeypatch):
+    monkeypatch.setattr(parameterSweep, "cpu_count", lambda: 64)
+    assert licenseTokens(1) == 5 and licenseTokens(4) == 8 and licenseTokens(16) == 16
+    assert ParameterSweep(FakeBackend(), maxJobs = 8, cpusPerJob = 4).getSlots() == 8
+    assert ParameterSweep(FakeBackend(), maxJobs = 8, cpusPerJob = 4, tokens = 20).getSlots() == 2
+    assert ParameterSweep(FakeBackend(), maxJobs = 8, cpusPerJob = 1, tokens = 20).getSlots() == 4
+    with pytest.raises(Exception):
+        ParameterSweep(FakeBackend(), cpusPerJob = 16, tokens = 10).getSlots()
+
+def test_superpose():
+    loads = [-10., -20., -35.]
+    sweep = ParameterSweep(FakeBackend(delay = 0.), superpose = True)
+    sweep.addCases(load = loads, a_q = [120, 140])
+    sweep.run()
+
+    # one unit load job per profile
+    files = set(record["resultFile"] for record in sweep.records.values())
+    assert len(sweep.records) == 6 and len(files) == 2
+
+    for record in sweep.records.values():
+        unit = ResultData()
+        unit.Load(record["resultFile"])
+        scaled = unit.scaled(record["loadFactor"])
+        direct = FakeBackend(delay = 0.).solve(InputData(**record["params"]))
+        assert record["loadFactor"] == record["params"]["load"]
+        assert np.allclose(scaled.disp, direct.disp)
+        assert record["maxDisp"] == pytest.approx(direct.getMaxDisp())
+        assert np.allclose(record["sumRFo"], direct.sumRFo)
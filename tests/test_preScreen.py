@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from inputData import InputData
+from preScreen import CHECK_MESSAGES, PROPPED, SIMPLY_SUPPORTED, ProfileScreen
+
+# one valid row and one row per rule of InputData.Check
+ROWS = [{},
+        {"b_t": 0.},
+        {"h_t": 0.},
+        {"s_t": 0.},
+        {"b_t": 5., "h_t": 50.},
+        {"h_t": 5.},
+        {"a_q": 0.},
+        {"b_q": 0.},
+        {"s_q": 70.},
+        {"a_q": 90.}]
+
+# error code of InputData.Check, 0 if the data is valid
+def checkCode(data):
+    try:
+        data.Check()
+    except Exception as e:
+        message = e.args[0].lower()
+        for code, text in CHECK_MESSAGES.items():
+            if text.lower() in message: return code
+        raise
+    return 0
+
+def test_check_rows():
+    profiles = [InputData(check = False, **row) for row in ROWS]
+    expected = [checkCode(data) for data in profiles]
+    assert expected[0] == 0
+    assert sorted(expected[1:]) == list(range(1, 10))
+    assert list(ProfileScreen.fromProfiles(profiles).Check()) == expected
+
+def test_deflection_closed_form():
+    data = InputData()
+    data.calcHelpers()
+    screen = ProfileScreen(data)
+
+    # thin walled Triple-T section from rectangles, all walls s_q thick
+    s, qs, qy, ly, bt = data.s_q, screen.qs[0], screen.quad_y[0], screen.lower_y[0], data.b_t
+    parts = [(2 * qs * s, qy, 2 * qs * s**3 / 12.),
+             (2 * qs * s, -qy, 2 * qs * s**3 / 12.),
+             (2 * qy * s, 0., s * (2 * qy)**3 / 12.),
+             (2 * qy * s, 0., s * (2 * qy)**3 / 12.)]
+    parts += 3 * [((ly - qy) * s, -(qy + ly) / 2., s * (ly - qy)**3 / 12.),
+                  (bt * s, -ly, bt * s**3 / 12.)]
+    area = sum(a for a, y, i in parts)
+    yc   = sum(a * y for a, y, i in parts) / area
+    Ix   = sum(i + a * (y - yc)**2 for a, y, i in parts)
+
+    properties = screen.sectionProperties()
+    assert properties["area"][0] == pytest.approx(area)
+    assert properties["Ix"][0] == pytest.approx(Ix)
+
+    q = data.load * 1.e3 / (data.l * (data.b_t + data.a_q)) * 2 * qs
+    w = 5. * q * data.l**4 / (384. * data.EMod * Ix)
+    assert screen.midspanDeflection()[0] == pytest.approx(w)
+    assert screen.midspanDeflection(PROPPED)[0] == pytest.approx(0.4 * w)
+    assert PROPPED / SIMPLY_SUPPORTED == pytest.approx(0.4)
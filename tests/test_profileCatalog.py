@@ -0,0 +1,40 @@
+import pytest
+
+from inputData import InputData, convertParameters
+from profileCatalog import ProfileCatalog
+
+def writeCatalog(filename, rows):
+    f = open(filename, "w")
+    f.write("name,a_q,b_q,s_q,load,numCpus,numDomains\n")
+    for row in rows: f.write(",".join(str(value) for value in row) + "\n")
+    f.close()
+
+def test_catalog(capsys):
+    rows = [("P%d" % i, 120 + i % 40, 60, 4, -20., "", "") for i in range(50)]
+    rows += [("BAD1", 90, 60, 4, -20., "", ""),      # the T beams collide
+             ("BADC", 120, 60, 4, -20., 2.5, ""),    # cpus not an integer
+             ("BAD2", 120, 60, 70, -20., "", ""),    # thickness above the height
+             ("BAD3", 120, 60, 4, -20., 2, 3)]       # domains not a multiple of cpus
+    writeCatalog("profiles.csv", rows)
+    base = InputData()
+    capsys.readouterr()
+
+    catalog  = ProfileCatalog("profiles.csv", base = base, batchSize = 16, errorFile = "errors.jsonl")
+    profiles = list(catalog.profiles())
+
+    # the valid rows are not checked again, so nothing is printed
+    assert "SUCCESSFUL" not in capsys.readouterr().out
+    assert [data.name for data in profiles] == ["P%d" % i for i in range(50)]
+    assert profiles[7].a_q == 127. and profiles[7].jobname == "P7-Linear"
+
+    report = catalog.getReport()
+    assert (report["rows"], report["valid"], report["invalid"]) == (54, 50, 4)
+    # conversion and check errors in the order of the lines
+    assert [error["name"] for error in report["errors"]] == ["BAD1", "BADC", "BAD2", "BAD3"]
+    assert [error["line"] for error in report["errors"]] == [52, 53, 54, 55]
+    assert len(open("errors.jsonl").readlines()) == 4
+
+def test_integer_values():
+    assert convertParameters({"numCpus": "4", "lengthSeed": "10.0"}) == {"numCpus": 4, "lengthSeed": 10}
+    with pytest.raises(Exception):
+        convertParameters({"numCpus": "2.5"})
@@ -0,0 +1,47 @@
+import pytest
+
+import fakeAbaqus
+fakeAbaqus.install()
+
+try:
+    from importlib import reload
+except ImportError:
+    pass
+
+import quadBeamModel
+from inputData import InputData
+
+def getBuilt(model):
+    return [record["stage"] for record in model.timer.records if not record.get("reused")]
+
+def build(data):
+    fakeAbaqus.register(data)
+    model = quadBeamModel.QuadBeamModel(data, 1)
+    model.build()
+    return model
+
+def test_load_change_after_reload():
+    assert "database" in getBuilt(build(InputData(name = "RL")))
+
+    # a script run in the same session reloads the module
+    reload(quadBeamModel)
+    built = getBuilt(build(InputData(name = "RL", load = -10.)))
+    assert built == ["loads", "job"]
+    for stage in ("database", "part", "seeds", "mesh"):
+        assert stage not in built
+    quadBeamModel.QuadBeamModel(InputData(name = "RL"), 1).delete()
+
+def test_seed_change():
+    build(InputData(name = "SC"))
+    built = getBuilt(build(InputData(name = "SC", lengthSeed = 20)))
+    assert built == ["seeds", "mesh", "sets", "loads", "job"]
+    quadBeamModel.QuadBeamModel(InputData(name = "SC"), 1).delete()
+
+def test_vertex_off_mesh():
+    # the mesh of the fake is generated from other T flanges than the vertices
+    fakeAbaqus.register(InputData(name = "VM", b_t = 40.))
+    model = quadBeamModel.QuadBeamModel(InputData(name = "VM"), 1)
+    with pytest.raises(Exception) as error:
+        model.build()
+    assert "No mesh node" in str(error.value)
+    model.delete()
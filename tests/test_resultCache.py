@@ -0,0 +1,29 @@
+import numpy as np
+
+from inputData import InputData, convertParameters
+from resultCache import ResultCache
+from resultData import ResultData
+
+def test_key_types():
+    cache = ResultCache("cache")
+    key   = cache.getKey(InputData())
+    assert cache.getKey(InputData(a_q = 120.0, load = -29.0)) == key
+    assert cache.getKey(InputData(**convertParameters({"a_q": "120", "lengthSeed": "10.0"}))) == key
+    assert cache.getKey(InputData(name = "other", numCpus = 4)) == key
+    assert cache.getKey(InputData(a_q = 120.0 + 1.e-12)) == key
+    assert cache.getKey(InputData(a_q = 121)) != key
+
+def test_backend_entries():
+    result = ResultData()
+    result.setNodes([1, 2], np.zeros((2, 3)))
+    result.setDisplacements([1, 2], np.ones((2, 3)))
+
+    cache = ResultCache("cache")
+    data  = InputData()
+    cache.put(data, result, backend = "fake")
+    assert cache.get(data, "local") is None
+    cache.put(data, result.scaled(2.), backend = "local")
+    assert len(cache.index) == 2
+    assert sorted(entry["backend"] for entry in cache.index.values()) == ["fake", "local"]
+    assert cache.get(data, "fake").disp[0,1] == 1.
+    assert cache.get(data, "local").disp[0,1] == 2.
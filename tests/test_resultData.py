@@ -0,0 +1,24 @@
+import pytest
+
+from inputData import InputData
+from parameterSweep import LocalBackend
+from resultData import ResultData
+
+@pytest.fixture(scope="module")
+def full():
+    return LocalBackend().solve(InputData())
+
+@pytest.mark.parametrize("symmetry, approximate", [(1, False), (2, True)])
+def test_expand_symmetry(full, symmetry, approximate):
+    result = LocalBackend().solve(InputData(symmetry = symmetry))
+    assert result.approximate == approximate
+    assert len(result.labels) == len(full.labels)
+    # the half model matches the full one, the quarter model is about 1.6% softer
+    error = abs(result.getMaxDisp() / full.getMaxDisp() - 1.)
+    assert error < (0.03 if approximate else 1.e-4)
+
+    result.Save("result.npz")
+    loaded = ResultData()
+    loaded.Load("result.npz")
+    assert loaded.approximate == approximate
+    assert loaded.scaled(2.).approximate == approximate
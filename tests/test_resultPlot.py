@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from parameterSweep import FakeBackend, LocalBackend, ParameterSweep
+from resultCache import ResultCache
+from resultData import ResultData
+from resultPlot import ResultRenderer
+
+def getMaxDisp(filename, factor):
+    result = ResultData()
+    result.Load(filename)
+    return factor * result.getMaxDisp()
+
+@pytest.mark.parametrize("superpose", [False, True])
+def test_select_runs(superpose):
+    sweep = ParameterSweep(FakeBackend(delay = 0.), superpose = superpose)
+    sweep.addCases(load = [-10., -20., -30.])
+    sweep.run()
+
+    renderer = ResultRenderer(processes = 1)
+    runs = renderer.selectRuns(sweep.records.values(), count = 2)
+    assert len(runs) == 2
+    records = sorted(sweep.records.values(), key = lambda record: -abs(record["maxDisp"]))
+    for (filename, output, factor), record in zip(runs, records):
+        assert os.path.exists(filename)
+        assert output == os.path.join(".", record["params"]["name"] + "-U2.png")
+        assert getMaxDisp(filename, factor) == pytest.approx(record["maxDisp"])
+    # the superposed cases share the result file of the unit load job
+    assert (runs[0][0] == runs[1][0]) == superpose
+
+def test_select_cached_runs():
+    cache = ResultCache("cache")
+    sweep = ParameterSweep(LocalBackend(), cache = cache, stateFile = "first.state")
+    sweep.addCases(load = -10.)
+    sweep.run()
+    again = ParameterSweep(LocalBackend(), cache = cache, stateFile = "second.state")
+    again.addCases(load = -10.)
+    again.run()
+
+    record = list(again.records.values())[0]
+    assert record["cached"]
+    (filename, output, factor), = ResultRenderer().selectRuns([record])
+    assert os.path.dirname(filename) == os.path.abspath("cache")
+    assert getMaxDisp(filename, factor) == pytest.approx(record["maxDisp"])
+
+def test_render():
+    pytest.importorskip("matplotlib")
+    sweep = ParameterSweep(FakeBackend(delay = 0.), superpose = True)
+    sweep.addCases(load = [-10., -20.])
+    sweep.run()
+    renderer = ResultRenderer(processes = 2)
+    images   = renderer.render(renderer.selectRuns(sweep.records.values()))
+    assert len(images) == 2 and all(os.path.exists(image) for image in images)
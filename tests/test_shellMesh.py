@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from inputData import InputData
+from geometry import getGeometry
+from logWriter import INFO, WARNING
+from shellMesh import ShellMesh
+
+SEEDS = [{}, {"lengthSeed": 16, "quadWidthSeed": 12, "quadHeightSeed": 3, "tFlangeSeed": 4, "tWebSeed": 6}]
+
+# elements of a cross section layer from the seeds
+def sectionElements(data):
+    d = data
+    full = 2 * d.quadWidthSeed + 2 * d.quadHeightSeed + 3 * (d.tFlangeSeed + 2 * d.tWebSeed)
+    if d.symmetry == d.FULL: return full
+    # x >= 0: half of the tube, the web and a flange of T2 and T3
+    return d.quadWidthSeed + d.quadHeightSeed + 2 * d.tFlangeSeed + 3 * d.tWebSeed
+
+def layers(data):
+    return data.lengthSeed // 2 if data.symmetry == data.QUARTER else data.lengthSeed
+
+def nodesAt(mesh, points, z):
+    c = mesh.coords
+    mask = np.zeros(len(c), dtype=bool)
+    for x, y in points:
+        mask |= (np.abs(c[:,0] - x) < 1.e-6) & (np.abs(c[:,1] - y) < 1.e-6) & (np.abs(c[:,2] - z) < 1.e-6)
+    return np.sort(mesh.labels[mask])
+
+@pytest.fixture(params=[(symmetry, i) for symmetry in (0, 1, 2) for i in range(len(SEEDS))],
+                ids=lambda p: "symmetry%d-seeds%d" % p)
+def model(request):
+    symmetry, i = request.param
+    data = InputData(symmetry = symmetry, **SEEDS[i])
+    return data, ShellMesh(data)
+
+def test_counts(model):
+    data, mesh = model
+    n, nz = sectionElements(data), layers(data)
+    # one node per element in the section: a closed tube with the T trees
+    # attached, the open half tube has one node more
+    points = n if data.symmetry == data.FULL else n + 1
+    assert len(mesh.elements) == n * nz
+    assert len(mesh.labels) == points * (nz + 1)
+    assert len(np.unique(mesh.labels)) == len(mesh.labels)
+    zmax = data.l / 2. if data.symmetry == data.QUARTER else data.l
+    assert mesh.coords[:,2].min() == pytest.approx(0.)
+    assert mesh.coords[:,2].max() == pytest.approx(zmax)
+    if data.symmetry != data.FULL:
+        assert mesh.coords[:,0].min() > -1.e-6
+
+def test_connectivity(model):
+    data, mesh = model
+    index = dict((label, i) for i, label in enumerate(mesh.labels))
+    used  = set()
+    for nodes in mesh.elements:
+        assert len(set(nodes)) == 4
+        c = mesh.coords[[index[node] for node in nodes]]
+        # (a,k), (b,k), (b,k+1), (a,k+1): one edge in the section, one along z
+        assert c[0,2] == pytest.approx(c[1,2]) and c[2,2] == pytest.approx(c[3,2])
+        assert c[2,2] > c[1,2]
+        assert np.allclose(c[0,:2], c[3,:2]) and np.allclose(c[1,:2], c[2,:2])
+        assert np.linalg.norm(c[1] - c[0]) > 0.
+        used.update(nodes)
+    # every node belongs to an element
+    assert used == set(mesh.labels)
+
+def test_sets(model):
+    data, mesh = model
+    geometry = getGeometry(data)
+    sets = mesh.getNodeSets()
+    c    = mesh.coords
+    last = c[:,2].max()
+
+    top = (np.abs(c[:,1] - data.quad_y) < 1.e-6) & (np.abs(c[:,0]) <= data.qs + 1.e-6)
+    assert np.array_equal(np.sort(sets["S"]), np.sort(mesh.labels[top]))
+
+    ends = [p[:2] for p in geometry.vertices["bcFixedAll"]]
+    bottoms = [geometry.points[name + "bottom"] for name in ("T1", "T2", "T3")]
+    if data.symmetry != data.FULL:
+        ends    = [p for p in ends if p[0] > -1.e-6]
+        bottoms = [p for p in bottoms if p[0] > -1.e-6]
+    if data.symmetry == data.QUARTER:
+        assert len(sets["bcFixedAll"]) == 0
+        assert np.array_equal(np.sort(sets["bcFixedY"]), nodesAt(mesh, ends, 0.))
+        onPlane = np.abs(c[:,2] - last) < 1.e-6
+        assert np.array_equal(np.sort(sets["ZSYMM"]), np.sort(mesh.labels[onPlane]))
+    else:
+        assert np.array_equal(np.sort(sets["bcFixedAll"]), nodesAt(mesh, ends, 0.))
+        assert np.array_equal(np.sort(sets["bcFixedY"]), nodesAt(mesh, ends, last))
+        assert "ZSYMM" not in sets
+    assert np.array_equal(np.sort(sets["bcFixedXZ"]), nodesAt(mesh, ends + bottoms, 0.))
+
+    if data.symmetry == data.FULL:
+        assert "XSYMM" not in sets
+    else:
+        onPlane = np.abs(c[:,0]) < 1.e-6
+        assert np.array_equal(np.sort(sets["XSYMM"]), np.sort(mesh.labels[onPlane]))
+
+    fiber = (np.abs(c[:,0]) < 1.e-6) & (np.abs(c[:,1] - data.quad_y) < 1.e-6)
+    assert np.array_equal(np.sort(sets["WEB"]), np.sort(mesh.labels[fiber]))
+    assert len(sets["WEB"]) == layers(data) + 1
+
+def test_element_sets(model):
+    data, mesh = model
+    sets = mesh.getElementSets()
+    assert len(sets["QuadSet"]) + len(sets["TSet"]) == len(mesh.elements)
+    assert len(np.intersect1d(sets["QuadSet"], sets["TSet"])) == 0
+    top = data.quadWidthSeed if data.symmetry == data.FULL else data.quadWidthSeed // 2
+    assert len(sets["TOP"]) == top * layers(data)
+    assert np.all(np.isin(sets["TOP"], sets["QuadSet"]))
+
+def test_quarter_warning(monkeypatch):
+    warnings = []
+    def appendLog(self, text, level = INFO):
+        if level >= WARNING: warnings.append(text)
+    monkeypatch.setattr(ShellMesh, "AppendLog", appendLog)
+
+    # the quarter model warns once when the mesh is built
+    mesh = ShellMesh(InputData(symmetry = 2))
+    mesh.getNodeSets()
+    mesh.getNodeSets()
+    assert len(warnings) == 1
+    ShellMesh(InputData(symmetry = 1)).getNodeSets()
+    assert len(warnings) == 1
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from inputData import InputData
+from shellSolver import ShellSolver
+
+# reference of the local solver for CP1 with the default seeds
+MIDSPAN = -15.8873159
+
+@pytest.fixture(scope="module")
+def solved():
+    data = InputData()
+    return data, ShellSolver(data).solve()
+
+def test_midspan_deflection(solved):
+    data, result = solved
+    c = result.coords
+    midspan = (np.abs(c[:,0]) < 1.e-6) & (np.abs(c[:,1] - data.quad_y) < 1.e-6) & (np.abs(c[:,2] - data.l / 2.) < 1.e-6)
+    assert np.count_nonzero(midspan) == 1
+    assert result.disp[midspan,1][0] == pytest.approx(MIDSPAN, rel = 1.e-6)
+    # the maximum of the top face is at midspan on the fiber
+    assert result.getMaxDisp() == pytest.approx(MIDSPAN, rel = 1.e-6)
+
+def test_reaction_sum(solved):
+    data, result = solved
+    # the pressure acts on the top face of width 2 qs
+    load = -data.p1 * data.l * 2. * data.qs
+    assert result.sumRFo[1] == pytest.approx(load, rel = 1.e-6)
+    assert abs(result.sumRFo[0]) < 1.e-6 * load
+    assert abs(result.sumRFo[2]) < 1.e-6 * load
+
+def test_linear_in_load(solved):
+    data, result = solved
+    half = ShellSolver(InputData(load = data.load / 2.)).solve()
+    assert half.getMaxDisp() == pytest.approx(result.getMaxDisp() / 2., rel = 1.e-9)
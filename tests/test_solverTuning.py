@@ -0,0 +1,25 @@
+import pytest
+
+from inputData import InputData
+from solverTuning import SolverTuner
+
+LARGE = {"lengthSeed": 400, "quadWidthSeed": 80}
+
+@pytest.mark.parametrize("numDomains", [1, 2, 4, 5, 6, 7, 12])
+def test_domains_multiple_of_cpus(numDomains):
+    for cores in (1, 3, 8, 16):
+        settings = SolverTuner(cores = cores, hostMemory = 16000.).tune(InputData(numDomains = numDomains, **LARGE))
+        assert settings["numDomains"] == numDomains
+        assert settings["numDomains"] % settings["numCpus"] == 0
+        # the settings are valid InputData parameters
+        InputData(**settings)
+
+def test_share_of_host():
+    small = SolverTuner(cores = 8, concurrentJobs = 4, hostMemory = 16000.).tune(InputData())
+    assert small == {"numCpus": 1, "numDomains": 1, "memory": 22.5, "mpMode": 0}
+    large = SolverTuner(cores = 8, hostMemory = 16000.).tune(InputData(**LARGE))
+    assert large["numCpus"] == 8 and large["numDomains"] == 8 and large["mpMode"] == 1
+
+def test_explicit_settings():
+    data = InputData(numCpus = 2, numDomains = 6, memory = 50., mpMode = 2)
+    assert SolverTuner(cores = 16).tune(data, cpus = 8) == {"numCpus": 2, "numDomains": 6, "memory": 50., "mpMode": 2}